@@ -18,6 +18,18 @@ CONSENT_PATTERNS = [
     r'reply\s+STOP\s+to\s+cancel',
     r'text\s+messaging\s+terms'
 ]
+_CONSENT_RES = [re.compile(pattern, re.IGNORECASE) for pattern in CONSENT_PATTERNS]
+
+# Phone input fields that trigger the consent checks
+_PHONE_RES = [
+    re.compile(pattern, re.IGNORECASE) for pattern in [
+        r'<input[^>]*(?:name|id)=["\'](?:phone|mobile|cell|tel)["\'][^>]*>',
+        r'<input[^>]*type=["\']tel["\'][^>]*>',
+        r'(?:phone|mobile|cell|telephone).*?(?:input|field|textfield)',
+    ]
+]
+_RATES_RE = re.compile(r'message\s+and\s+data\s+rates', re.IGNORECASE)
+_STOP_RE = re.compile(r'STOP|stop\s+to\s+(?:cancel|unsubscribe|opt[- ]?out)', re.IGNORECASE)
 
 def check_tcpa_compliance(file_path, content):
     """Check if phone fields have proper TCPA consent"""
@@ -29,34 +41,20 @@ def check_tcpa_compliance(file_path, content):
     violations = []
     
     # Look for phone input fields
-    phone_patterns = [
-        r'<input[^>]*(?:name|id)=["\'](?:phone|mobile|cell|tel)["\'][^>]*>',
-        r'<input[^>]*type=["\']tel["\'][^>]*>',
-        r'(?:phone|mobile|cell|telephone).*?(?:input|field|textfield)',
-    ]
-    
-    has_phone_field = False
-    for pattern in phone_patterns:
-        if re.search(pattern, content, re.IGNORECASE):
-            has_phone_field = True
-            break
+    has_phone_field = any(pattern.search(content) for pattern in _PHONE_RES)
     
     if has_phone_field:
         # Check for consent language
-        has_consent = False
-        for consent_pattern in CONSENT_PATTERNS:
-            if re.search(consent_pattern, content, re.IGNORECASE):
-                has_consent = True
-                break
+        has_consent = any(pattern.search(content) for pattern in _CONSENT_RES)
         
         if not has_consent:
             violations.append("Phone field detected without TCPA consent language")
         
         # Check for specific required elements
-        if not re.search(r'message\s+and\s+data\s+rates', content, re.IGNORECASE):
+        if not _RATES_RE.search(content):
             violations.append("Missing 'Message and data rates may apply' disclosure")
         
-        if not re.search(r'STOP|stop\s+to\s+(?:cancel|unsubscribe|opt[- ]?out)', content, re.IGNORECASE):
+        if not _STOP_RE.search(content):
             violations.append("Missing STOP instructions for opt-out")
     
     return violations
@@ -6,20 +6,37 @@ Part of v4.0 automation plan - Issue #21
 """
 
 import sys
-import json
 import re
+import hashlib
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'utils'))
+from hook_io import read_input, loads, dumps_indented
+
+# Response-code and auth signals, detected in a single pass over the route source
+_SIGNALS_RE = re.compile(
+    r'(?P<bad_request>400|BadRequest)|(?P<unauthorized>401|Unauthorized)'
+    r'|(?P<session>session)|(?P<auth>(?i:auth))'
+)
+
+# Shared fields for extracted parameters, spread between name and description
+# so keys keep the order existing specs were written with
+_PATH_PARAM_TMPL = {'in': 'path', 'required': True, 'schema': {'type': 'string'}}
+_QUERY_PARAM_TMPL = {'in': 'query', 'required': False, 'schema': {'type': 'string'}}
+
+# Parsed OpenAPI specs keyed by path: (mtime, spec, digest of the bytes on disk)
+_SPEC_CACHE: Dict[Path, Tuple[float, Dict, bytes]] = {}
 
 class APIDocumentationGenerator:
     def __init__(self):
         self.openapi_dir = Path('.claude/api-docs/openapi')
-        self.openapi_dir.mkdir(parents=True, exist_ok=True)
         
     def extract_api_info(self, content: str, path: str) -> Dict[str, Any]:
         """Extract API information from route handler"""
+        api_path, tags = self._tokenize_path(path)
         api_info = {
-            'path': self._extract_api_path(path),
+            'path': api_path,
             'methods': [],
             'description': '',
             'tool_input': [],
@@ -46,55 +63,73 @@ class APIDocumentationGenerator:
         if any(method in api_info['methods'] for method in ['POST', 'PUT', 'PATCH']):
             api_info['requestBody'] = self._extract_request_body(content)
         
+        signals = self._scan_signals(content)
+        
         # Extract response schemas
-        api_info['responses'] = self._extract_responses(content)
+        api_info['responses'] = self._extract_responses(signals)
         
         # Extract security requirements
-        if 'auth' in content.lower() or 'session' in content:
+        if 'auth' in signals or 'session' in signals:
             api_info['security'] = [{'bearerAuth': []}]
         
-        # Extract tags from path
-        api_info['tags'] = self._extract_tags(path)
+        # Tags come from the first meaningful path segment
+        api_info['tags'] = tags
         
         return api_info
     
-    def _extract_api_path(self, file_path: str) -> str:
-        """Convert file path to API path"""
-        # app/api/users/[id]/route.ts -> /api/users/{id}
-        path = file_path.replace('app/', '/').replace('/route.ts', '').replace('/route.js', '')
-        path = re.sub(r'\[([^\]]+)\]', r'{\1}', path)
-        return path
+    def _tokenize_path(self, file_path: str) -> Tuple[str, List[str]]:
+        """Derive the API path and tags from a route file path in one pass"""
+        # app/api/users/[id]/route.ts -> ('/api/users/{id}', ['Users'])
+        for marker in ('app/api/', 'pages/api/'):
+            start = file_path.find(marker)
+            if start != -1:
+                file_path = file_path[file_path.index('api/', start):]
+                break
+        
+        segments = file_path.split('/')
+        last = segments.pop()
+        if last not in ('route.ts', 'route.js'):
+            # Pages router: the file itself names the endpoint
+            stem = last.rsplit('.', 1)[0]
+            if stem != 'index':
+                segments.append(stem)
+        
+        tags = []
+        for segment in segments:
+            if segment != 'api' and not segment.startswith('['):
+                tags.append(segment.capitalize())  # Use first meaningful part as tag
+                break
+        
+        # Brackets only ever delimit dynamic segments in Next.js routes
+        path = ('/' + '/'.join(segments)).replace('[', '{').replace(']', '}')
+        return path, tags
     
     def _extract_path_params(self, path: str) -> List[Dict]:
         """Extract path parameters"""
         params = []
+        seen = set()
         # Match [param] or {param} patterns
         pattern = r'[\[{]([^\]}]+)[\]}]'
         for match in re.finditer(pattern, path):
             param_name = match.group(1)
-            params.append({
-                'name': param_name,
-                'in': 'path',
-                'required': True,
-                'schema': {'type': 'string'},
-                'description': f'{param_name} parameter'
-            })
+            if param_name in seen:
+                continue
+            seen.add(param_name)
+            params.append({'name': param_name, **_PATH_PARAM_TMPL, 'description': f'{param_name} parameter'})
         return params
     
     def _extract_query_params(self, content: str) -> List[Dict]:
         """Extract query parameters from code"""
         params = []
+        seen = set()
         # Look for searchParams.get() patterns
         pattern = r'searchParams\.get\([\'"](\w+)[\'"]\)'
         for match in re.finditer(pattern, content):
             param_name = match.group(1)
-            params.append({
-                'name': param_name,
-                'in': 'query',
-                'required': False,
-                'schema': {'type': 'string'},
-                'description': f'{param_name} query parameter'
-            })
+            if param_name in seen:
+                continue
+            seen.add(param_name)
+            params.append({'name': param_name, **_QUERY_PARAM_TMPL, 'description': f'{param_name} query parameter'})
         return params
     
     def _extract_request_body(self, content: str) -> Dict:
@@ -159,7 +194,16 @@ class APIDocumentationGenerator:
         
         return schema
     
-    def _extract_responses(self, content: str) -> Dict:
+    def _scan_signals(self, content: str) -> set:
+        """Collect response-code and auth signals from route source"""
+        signals = set()
+        for match in _SIGNALS_RE.finditer(content):
+            signals.add(match.lastgroup)
+            if match.group() == 'Unauthorized':
+                signals.add('auth')  # 'auth' is consumed inside this match
+        return signals
+    
+    def _extract_responses(self, signals: set) -> Dict:
         """Extract response schemas"""
         responses = {
             '200': {
@@ -176,7 +220,7 @@ class APIDocumentationGenerator:
         }
         
         # Look for error responses
-        if '400' in content or 'BadRequest' in content:
+        if 'bad_request' in signals:
             responses['400'] = {
                 'description': 'Bad request',
                 'content': {
@@ -191,7 +235,7 @@ class APIDocumentationGenerator:
                 }
             }
         
-        if '401' in content or 'Unauthorized' in content:
+        if 'unauthorized' in signals:
             responses['401'] = {
                 'description': 'Unauthorized',
                 'content': {
@@ -208,17 +252,6 @@ class APIDocumentationGenerator:
         
         return responses
     
-    def _extract_tags(self, path: str) -> List[str]:
-        """Extract tags from API path"""
-        parts = path.split('/')
-        tags = []
-        
-        for part in parts:
-            if part and part != 'api' and not part.startswith('{'):
-                tags.append(part.capitalize())
-        
-        return tags[:1]  # Use first meaningful part as tag
-    
     def generate_openapi_spec(self, api_info: Dict, existing_spec: Dict = None) -> Dict:
         """Generate or update OpenAPI specification"""
         if existing_spec is None:
@@ -270,6 +303,40 @@ class APIDocumentationGenerator:
         
         return existing_spec
 
+def _digest(data: bytes) -> bytes:
+    """Fast content fingerprint for change detection"""
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+def load_openapi_spec(openapi_path: Path) -> Optional[Dict]:
+    """Load the existing OpenAPI spec, reusing the cached parse if unchanged"""
+    try:
+        mtime = openapi_path.stat().st_mtime
+    except FileNotFoundError:
+        return None
+    
+    cached = _SPEC_CACHE.get(openapi_path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    
+    raw = openapi_path.read_bytes()
+    spec = loads(raw)
+    _SPEC_CACHE[openapi_path] = (mtime, spec, _digest(raw))
+    return spec
+
+def save_openapi_spec(openapi_path: Path, spec: Dict) -> bool:
+    """Write the OpenAPI spec unless it is byte-identical to the file on disk"""
+    payload = dumps_indented(spec)
+    digest = _digest(payload)
+    
+    cached = _SPEC_CACHE.get(openapi_path)
+    if cached and cached[2] == digest:
+        return False
+    
+    openapi_path.parent.mkdir(parents=True, exist_ok=True)
+    openapi_path.write_bytes(payload)
+    _SPEC_CACHE[openapi_path] = (openapi_path.stat().st_mtime, spec, digest)
+    return True
+
 def check_for_api_creation(input_data):
     """Check if creating an API route"""
     tool_name = input_data.get('tool_name', '')
@@ -284,9 +351,11 @@ def check_for_api_creation(input_data):
 
 def main():
     """Main hook logic"""
+    # Status lines are buffered and emitted with a single write
+    out = []
     try:
         # Read input from stdin
-        input_data = json.loads(sys.stdin.read())
+        input_data = read_input()
         
         if not check_for_api_creation(input_data):
             sys.exit(0)
@@ -305,8 +374,8 @@ def main():
         if '--no-api-docs' in content:
             sys.exit(0)
         
-        print(f"\n📚 AUTO-GENERATING API DOCUMENTATION", file=sys.stderr)
-        print(f"   API Route: {path}", file=sys.stderr)
+        out.append("\n📚 AUTO-GENERATING API DOCUMENTATION\n")
+        out.append(f"   API Route: {path}\n")
         
         generator = APIDocumentationGenerator()
         
@@ -315,23 +384,24 @@ def main():
         
         # Load existing OpenAPI spec
         openapi_path = generator.openapi_dir / 'openapi.json'
-        existing_spec = {}
-        if openapi_path.exists():
-            with open(openapi_path) as f:
-                existing_spec = json.load(f)
+        existing_spec = load_openapi_spec(openapi_path)
         
         # Generate or update OpenAPI spec
         openapi_spec = generator.generate_openapi_spec(api_info, existing_spec)
         
         # Save OpenAPI spec
-        with open(openapi_path, 'w') as f:
-            json.dump(openapi_spec, f, indent=2)
+        if save_openapi_spec(openapi_path, openapi_spec):
+            out.append(f"✅ Updated OpenAPI spec: {openapi_path}\n")
+        else:
+            out.append(f"✅ OpenAPI spec already up to date: {openapi_path}\n")
         
-        print(f"✅ Updated OpenAPI spec: {openapi_path}", file=sys.stderr)
+        sys.stderr.write(''.join(out))
+        sys.stderr.flush()
         
     except Exception as e:
         # Log error to stderr and continue
-        print(f"API docs generator hook error: {str(e)}", file=sys.stderr)
+        out.append(f"API docs generator hook error: {str(e)}\n")
+        sys.stderr.write(''.join(out))
         sys.exit(1)
 
 if __name__ == "__main__":
@@ -6,10 +6,136 @@ Part of v4.0 automation plan - Issue #23
 """
 
 import sys
+import os
 import json
-import re
+import hashlib
+from collections import Counter
+from functools import lru_cache
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent.parent / 'utils'))
+from hook_io import read_input, loads
+from hook_patterns import ELEMENT_RE, SIGNAL_RE, BTN_TEXT_RE, UI_RE, LANDMARK_RE, LOW_CONTRAST
+
+_EDIT_TOOLS = frozenset(('Write', 'Edit', 'MultiEdit'))
+
+# Score deducted per issue, by rule group
+_RULE_WEIGHTS = {
+    'interactive': 5,
+    'keyboard': 10,
+    'focus': 5,
+    'contrast': 3,
+    'screen_reader': 5,
+}
+
+# Written to .claude/a11y-config.json when the project has none
+_DEFAULT_CONFIG = {
+    "wcag_level": "AA",
+    "required_tests": [
+        "keyboard_navigation",
+        "screen_reader",
+        "color_contrast",
+        "focus_management"
+    ],
+    "aria_requirements": {
+        "interactive_elements": ["button", "a", "input", "select", "textarea"],
+        "landmark_roles": ["main", "navigation", "complementary", "contentinfo"],
+        "required_attributes": {
+            "img": ["alt"],
+            "input": ["label", "aria-label", "aria-labelledby"],
+            "button": ["aria-label", "text-content"]
+        }
+    },
+    "minimum_scores": {
+        "overall": 95,
+        "keyboard": 100,
+        "screen_reader": 95,
+        "color_contrast": 90
+    }
+}
+
+# Generated artifact skeletons, filled with str.format
+_REQUIREMENTS_TEMPLATE = """# Accessibility Requirements: {component_name}
+
+## WCAG 2.1 Level {wcag_level} Compliance
+
+### Issues Found
+{issues}
+
+### Suggestions
+{suggestions}
+
+### Score: {score}/100
+"""
+
+_A11Y_TEST_TEMPLATE = """import {{ render, screen }} from '@testing-library/react';
+import {{ axe, toHaveNoViolations }} from 'jest-axe';
+import userEvent from '@testing-library/user-event';
+import {{ {component_name} }} from './{component_name}';
+
+expect.extend(toHaveNoViolations);
+
+describe('{component_name} Accessibility', () => {{
+  it('should not have any accessibility violations', async () => {{
+    const {{ container }} = render(<{component_name} />);
+    const results = await axe(container);
+    expect(results).toHaveNoViolations();
+  }});
+  
+  it('should be keyboard navigable', async () => {{
+    const user = userEvent.setup();
+    render(<{component_name} />);
+    
+    // Tab through interactive elements
+    await user.tab();
+    // Add specific keyboard navigation tests
+  }});
+  
+  it('should have proper ARIA labels', () => {{
+    render(<{component_name} />);
+    
+    // Check for accessible names
+    const buttons = screen.getAllByRole('button');
+    buttons.forEach(button => {{
+      expect(button).toHaveAccessibleName();
+    }});
+  }});
+  
+  it('should manage focus properly', async () => {{
+    const user = userEvent.setup();
+    render(<{component_name} />);
+    
+    // Test focus management
+    const firstElement = screen.getByRole('button');
+    await user.click(firstElement);
+    expect(firstElement).toHaveFocus();
+  }});
+  
+  it('should support screen readers', () => {{
+    render(<{component_name} />);
+    
+    // Check for proper heading hierarchy
+    const headings = screen.getAllByRole('heading');
+    // Add heading hierarchy tests
+  }});
+  
+  it('should have sufficient color contrast', () => {{
+    // This would typically be checked by axe
+    // Add any specific contrast tests if needed
+  }});
+}});
+"""
+
+# Recent analyses keyed by (content digest, config mtime), oldest evicted first
+_ANALYSIS_CACHE = {}
+_ANALYSIS_CACHE_SIZE = 128
+
+@lru_cache(maxsize=4)
+def _load_a11y_config(path, mtime):
+    """Parse the a11y config once per (path, mtime); treat the result as read-only"""
+    with open(path, 'rb') as f:
+        return loads(f.read())
+
 class AccessibilityAnalyzer:
     def __init__(self):
         self.a11y_config_path = Path('.claude/a11y-config.json')
@@ -17,75 +143,71 @@ class AccessibilityAnalyzer:
         
     def load_config(self):
         """Load accessibility configuration"""
-        default_config = {
-            "wcag_level": "AA",
-            "required_tests": [
-                "keyboard_navigation",
-                "screen_reader",
-                "color_contrast",
-                "focus_management"
-            ],
-            "aria_requirements": {
-                "interactive_elements": ["button", "a", "input", "select", "textarea"],
-                "landmark_roles": ["main", "navigation", "complementary", "contentinfo"],
-                "required_attributes": {
-                    "img": ["alt"],
-                    "input": ["label", "aria-label", "aria-labelledby"],
-                    "button": ["aria-label", "text-content"]
-                }
-            },
-            "minimum_scores": {
-                "overall": 95,
-                "keyboard": 100,
-                "screen_reader": 95,
-                "color_contrast": 90
-            }
-        }
-        
-        if self.a11y_config_path.exists():
-            with open(self.a11y_config_path) as f:
-                self.config = json.load(f)
+        # One stat answers both "does it exist" and the parse-cache key
+        try:
+            self.config_mtime = os.stat(self.a11y_config_path).st_mtime
+        except FileNotFoundError:
+            self.config_mtime = None
+        
+        if self.config_mtime is not None:
+            self.config = _load_a11y_config(str(self.a11y_config_path), self.config_mtime)
         else:
-            self.config = default_config
-            self.a11y_config_path.parent.mkdir(parents=True, exist_ok=True)
+            self.config = _DEFAULT_CONFIG
+            _ensure_dir(self.a11y_config_path.parent)
             with open(self.a11y_config_path, 'w') as f:
-                json.dump(default_config, f, indent=2)
+                json.dump(_DEFAULT_CONFIG, f, indent=2)
+    
+    def _scan(self, content):
+        """Collect markup elements and counted text signals in a single pass each"""
+        elements = {'button': [], 'link': [], 'img': [], 'input': [], 'heading': []}
+        ends = dict.fromkeys(elements, 0)
+        for match in ELEMENT_RE.finditer(content):
+            kind = match.lastgroup
+            # Tags of the same kind never overlap, matching a per-pattern findall
+            if match.start() >= ends[kind]:
+                elements[kind].append(match.group(kind))
+                ends[kind] = match.end(kind)
+        
+        signals = Counter(match.lastgroup for match in SIGNAL_RE.finditer(content))
+        # Longer alternatives consume the shorter signals they contain
+        if 'pos_tabindex' in signals:
+            signals['tabindex'] += signals['pos_tabindex']
+        if 'focus_style' in signals or 'focus_visible' in signals:
+            signals['focus'] += 1
+        
+        return elements, signals
     
     def analyze_component(self, content, component_name):
-        """Analyze component for accessibility issues"""
+        """Analyze component for accessibility issues, reusing results for identical content"""
+        key = (hashlib.blake2b(content.encode(), digest_size=16).digest(), self.config_mtime)
+        analysis = _ANALYSIS_CACHE.get(key)
+        if analysis is None:
+            analysis = self._analyze(content)
+            if len(_ANALYSIS_CACHE) >= _ANALYSIS_CACHE_SIZE:
+                del _ANALYSIS_CACHE[next(iter(_ANALYSIS_CACHE))]
+            _ANALYSIS_CACHE[key] = analysis
+        return analysis
+    
+    def _analyze(self, content):
+        """Run every accessibility rule group over the content"""
         issues = []
         suggestions = []
         score = 100
         
-        # Check for interactive elements without proper ARIA
-        interactive_issues = self._check_interactive_elements(content)
-        issues.extend(interactive_issues['issues'])
-        suggestions.extend(interactive_issues['suggestions'])
-        score -= len(interactive_issues['issues']) * 5
-        
-        # Check for keyboard navigation
-        keyboard_issues = self._check_keyboard_navigation(content)
-        issues.extend(keyboard_issues['issues'])
-        suggestions.extend(keyboard_issues['suggestions'])
-        score -= len(keyboard_issues['issues']) * 10
-        
-        # Check for focus management
-        focus_issues = self._check_focus_management(content)
-        issues.extend(focus_issues['issues'])
-        suggestions.extend(focus_issues['suggestions'])
-        score -= len(focus_issues['issues']) * 5
-        
-        # Check for color contrast
-        contrast_issues = self._check_color_contrast(content)
-        issues.extend(contrast_issues['issues'])
-        suggestions.extend(contrast_issues['suggestions'])
-        score -= len(contrast_issues['issues']) * 3
-        
-        # Check for screen reader support
-        sr_issues = self._check_screen_reader_support(content)
-        issues.extend(sr_issues['issues'])
-        suggestions.extend(sr_issues['suggestions'])
-        score -= len(sr_issues['issues']) * 5
+        elements, signals = self._scan(content)
+        
+        # Each rule group's issues cost its weight in _RULE_WEIGHTS
+        results = (
+            ('interactive', self._check_interactive_elements(elements)),
+            ('keyboard', self._check_keyboard_navigation(signals)),
+            ('focus', self._check_focus_management(signals)),
+            ('contrast', self._check_color_contrast(content)),
+            ('screen_reader', self._check_screen_reader_support(content, elements, signals)),
+        )
+        for rule, result in results:
+            issues.extend(result['issues'])
+            suggestions.extend(result['suggestions'])
+            score -= len(result['issues']) * _RULE_WEIGHTS[rule]
         
         return {
             'score': max(0, score),
@@ -94,40 +216,32 @@ class AccessibilityAnalyzer:
             'passing': score >= self.config['minimum_scores']['overall']
         }
     
-    def _check_interactive_elements(self, content):
+    def _check_interactive_elements(self, elements):
         """Check interactive elements for proper ARIA attributes"""
         issues = []
         suggestions = []
         
         # Check buttons
-        button_pattern = r'<button[^>]*>'
-        buttons = re.findall(button_pattern, content)
-        for button in buttons:
-            if 'aria-label' not in button and not re.search(r'>\s*\w+', button):
+        for button in elements['button']:
+            if 'aria-label' not in button and not BTN_TEXT_RE.search(button):
                 issues.append("Button without accessible label")
                 suggestions.append("Add aria-label or text content to button")
         
         # Check links
-        link_pattern = r'<a[^>]*>'
-        links = re.findall(link_pattern, content)
-        for link in links:
+        for link in elements['link']:
             if 'href' in link and 'aria-label' not in link:
-                if not re.search(r'>\s*\w+', link):
+                if not BTN_TEXT_RE.search(link):
                     issues.append("Link without accessible text")
                     suggestions.append("Add aria-label or text content to link")
         
         # Check images
-        img_pattern = r'<img[^>]*>'
-        images = re.findall(img_pattern, content)
-        for img in images:
+        for img in elements['img']:
             if 'alt' not in img:
                 issues.append("Image without alt text")
                 suggestions.append("Add alt attribute to all images")
         
         # Check form inputs
-        input_pattern = r'<input[^>]*>'
-        inputs = re.findall(input_pattern, content)
-        for input_tag in inputs:
+        for input_tag in elements['input']:
             if 'aria-label' not in input_tag and 'aria-labelledby' not in input_tag:
                 if 'id' not in input_tag:
                     issues.append("Input without accessible label")
@@ -135,46 +249,42 @@ class AccessibilityAnalyzer:
         
         return {'issues': issues, 'suggestions': suggestions}
     
-    def _check_keyboard_navigation(self, content):
+    def _check_keyboard_navigation(self, signals):
         """Check for keyboard navigation support"""
         issues = []
         suggestions = []
         
         # Check for onClick without keyboard handlers
-        if 'onClick' in content:
-            onclick_count = content.count('onClick')
-            onkeydown_count = content.count('onKeyDown') + content.count('onKeyPress')
-            
-            if onclick_count > onkeydown_count:
-                issues.append("Click handlers without keyboard support")
-                suggestions.append("Add onKeyDown handlers for keyboard navigation")
+        if signals['onclick'] > signals['onkeydown'] + signals['onkeypress']:
+            issues.append("Click handlers without keyboard support")
+            suggestions.append("Add onKeyDown handlers for keyboard navigation")
         
         # Check for proper tab order
-        if 'tabIndex' in content:
+        if 'tabindex' in signals:
             # Check for positive tabIndex (bad practice)
-            if re.search(r'tabIndex=["\']?[1-9]', content):
+            if 'pos_tabindex' in signals:
                 issues.append("Positive tabIndex values detected")
                 suggestions.append("Use tabIndex={0} or {-1}, avoid positive values")
         
         # Check for focus traps
-        if 'focus' in content.lower() and 'blur' not in content:
+        if 'focus' in signals and 'blur' not in signals:
             suggestions.append("Ensure focus can move freely (no focus traps)")
         
         return {'issues': issues, 'suggestions': suggestions}
     
-    def _check_focus_management(self, content):
+    def _check_focus_management(self, signals):
         """Check for proper focus management"""
         issues = []
         suggestions = []
         
         # Check for focus styles
-        if 'focus:' not in content and 'focusVisible' not in content:
+        if 'focus_style' not in signals and 'focus_visible' not in signals:
             issues.append("No focus styles detected")
             suggestions.append("Add focus:ring or focus:outline styles for keyboard users")
         
         # Check for focus restoration
-        if 'Modal' in content or 'Dialog' in content:
-            if 'focus' not in content.lower():
+        if 'modal' in signals:
+            if 'focus' not in signals:
                 issues.append("Modal/Dialog without focus management")
                 suggestions.append("Implement focus trap and restoration for modals")
         
@@ -186,115 +296,77 @@ class AccessibilityAnalyzer:
         suggestions = []
         
         # Look for low contrast color combinations
-        low_contrast_patterns = [
-            (r'text-gray-[3-4]00.*bg-white', "Light gray text on white background"),
-            (r'text-white.*bg-gray-[1-3]00', "White text on light background"),
-            (r'text-yellow.*bg-white', "Yellow text on white background")
-        ]
-        
-        for pattern, issue in low_contrast_patterns:
-            if re.search(pattern, content):
+        for pattern, issue in LOW_CONTRAST:
+            if pattern.search(content):
                 issues.append(f"Potential low contrast: {issue}")
                 suggestions.append("Ensure 4.5:1 contrast ratio for normal text, 3:1 for large text")
         
         return {'issues': issues, 'suggestions': suggestions}
     
-    def _check_screen_reader_support(self, content):
+    def _check_screen_reader_support(self, content, elements, signals):
         """Check for screen reader support"""
         issues = []
         suggestions = []
         
         # Check for aria-live regions for dynamic content
-        if 'setState' in content or 'useState' in content:
-            if 'aria-live' not in content:
+        if 'state' in signals:
+            if 'aria_live' not in signals:
                 suggestions.append("Consider aria-live regions for dynamic content updates")
         
-        # Check for proper heading hierarchy
-        heading_pattern = r'<h(\d)'
-        headings = re.findall(heading_pattern, content)
+        # Check for proper heading hierarchy, in document order
+        headings = elements['heading']
         if headings:
-            heading_levels = sorted([int(h) for h in headings])
-            if heading_levels and heading_levels[0] != 1:
-                issues.append("Heading hierarchy doesn't start with h1")
+            prev_level = None
+            min_level = 10
+            skipped = False
+            for level in map(int, headings):
+                if prev_level is not None and level - prev_level > 1:
+                    skipped = True
+                if level < min_level:
+                    min_level = level
+                prev_level = level
             
-            # Check for skipped levels
-            for i in range(1, len(heading_levels)):
-                if heading_levels[i] - heading_levels[i-1] > 1:
-                    issues.append("Skipped heading levels detected")
-                    break
+            if min_level != 1:
+                issues.append("Heading hierarchy doesn't start with h1")
+            if skipped:
+                issues.append("Skipped heading levels detected")
         
         # Check for landmark roles
         if len(content) > 500:  # Only for substantial components
-            has_landmarks = any(role in content for role in ['role="main"', 'role="navigation"', '<main', '<nav'])
-            if not has_landmarks:
+            if not LANDMARK_RE.search(content):
                 suggestions.append("Consider using landmark roles for better navigation")
         
         return {'issues': issues, 'suggestions': suggestions}
     
     def generate_a11y_tests(self, component_name):
         """Generate accessibility tests for component"""
-        return f"""import {{ render, screen }} from '@testing-library/react';
-import {{ axe, toHaveNoViolations }} from 'jest-axe';
-import userEvent from '@testing-library/user-event';
-import {{ {component_name} }} from './{component_name}';
+        return _A11Y_TEST_TEMPLATE.format(component_name=component_name)
 
-expect.extend(toHaveNoViolations);
+# Directories already created by this process
+_ENSURED_DIRS = set()
 
-describe('{component_name} Accessibility', () => {{
-  it('should not have any accessibility violations', async () => {{
-    const {{ container }} = render(<{component_name} />);
-    const results = await axe(container);
-    expect(results).toHaveNoViolations();
-  }});
-  
-  it('should be keyboard navigable', async () => {{
-    const user = userEvent.setup();
-    render(<{component_name} />);
-    
-    // Tab through interactive elements
-    await user.tab();
-    // Add specific keyboard navigation tests
-  }});
-  
-  it('should have proper ARIA labels', () => {{
-    render(<{component_name} />);
-    
-    // Check for accessible names
-    const buttons = screen.getAllByRole('button');
-    buttons.forEach(button => {{
-      expect(button).toHaveAccessibleName();
-    }});
-  }});
-  
-  it('should manage focus properly', async () => {{
-    const user = userEvent.setup();
-    render(<{component_name} />);
-    
-    // Test focus management
-    const firstElement = screen.getByRole('button');
-    await user.click(firstElement);
-    expect(firstElement).toHaveFocus();
-  }});
-  
-  it('should support screen readers', () => {{
-    render(<{component_name} />);
-    
-    // Check for proper heading hierarchy
-    const headings = screen.getAllByRole('heading');
-    // Add heading hierarchy tests
-  }});
-  
-  it('should have sufficient color contrast', () => {{
-    // This would typically be checked by axe
-    // Add any specific contrast tests if needed
-  }});
-}});
-"""
+def _ensure_dir(path):
+    """Create a directory once per process"""
+    key = str(path)
+    if key not in _ENSURED_DIRS:
+        path.mkdir(parents=True, exist_ok=True)
+        _ENSURED_DIRS.add(key)
+
+def _write_if_changed(path, content):
+    """Write generated content unless the file already holds exactly that content"""
+    data = content.encode()
+    try:
+        if path.read_bytes() == data:
+            return False
+    except FileNotFoundError:
+        _ensure_dir(path.parent)
+    path.write_bytes(data)
+    return True
 
 def check_for_ui_component(input_data):
     """Check if creating a UI component"""
     tool_name = input_data.get('tool_name', '')
-    if tool_name not in ['Write', 'Edit', 'MultiEdit']:
+    if tool_name not in _EDIT_TOOLS:
         return False
     
     tool_input = input_data.get('tool_input', {})
@@ -311,14 +383,15 @@ def check_for_ui_component(input_data):
         content = tool_input.get('new_str', '')
     
     # Check for UI elements
-    ui_patterns = ['<button', '<input', '<select', '<form', '<a ', 'onClick', 'className=']
-    return any(pattern in content for pattern in ui_patterns)
+    return UI_RE.search(content) is not None
 
 def main():
     """Main hook logic"""
+    # Status lines are buffered and emitted with a single write
+    out = []
     try:
         # Read input from Claude Code via stdin
-        input_data = json.loads(sys.stdin.read())
+        input_data = read_input()
         
         if not check_for_ui_component(input_data):
             sys.exit(0)
@@ -337,60 +410,49 @@ def main():
         
         # Skip if opted out
         if '--no-a11y' in content:
-            print("♿ Accessibility checks skipped (--no-a11y flag)", file=sys.stderr)
+            sys.stderr.write("♿ Accessibility checks skipped (--no-a11y flag)\n")
             sys.exit(0)
         
-        print(f"\n♿ ACCESSIBILITY-FIRST DEVELOPMENT ENFORCED", file=sys.stderr)
-        print(f"   Component: {component_name}", file=sys.stderr)
+        out.append("\n♿ ACCESSIBILITY-FIRST DEVELOPMENT ENFORCED\n")
+        out.append(f"   Component: {component_name}\n")
         
         analyzer = AccessibilityAnalyzer()
         
         # Analyze component
         analysis = analyzer.analyze_component(content, component_name)
         
-        print(f"\n📊 Accessibility Score: {analysis['score']}/100", file=sys.stderr)
+        out.append(f"\n📊 Accessibility Score: {analysis['score']}/100\n")
         
         if analysis['issues']:
-            print("\n❌ Accessibility Issues Found:", file=sys.stderr)
-            for issue in analysis['issues']:
-                print(f"   - {issue}", file=sys.stderr)
+            out.append("\n❌ Accessibility Issues Found:\n")
+            out.extend(f"   - {issue}\n" for issue in analysis['issues'])
         
         if analysis['suggestions']:
-            print("\n💡 Suggestions:", file=sys.stderr)
-            for suggestion in analysis['suggestions']:
-                print(f"   - {suggestion}", file=sys.stderr)
+            out.append("\n💡 Suggestions:\n")
+            out.extend(f"   - {suggestion}\n" for suggestion in analysis['suggestions'])
         
         # Generate requirements
-        requirements_content = f"""# Accessibility Requirements: {component_name}
-
-## WCAG 2.1 Level {analyzer.config['wcag_level']} Compliance
-
-### Issues Found
-{chr(10).join(f'- {issue}' for issue in analysis['issues']) if analysis['issues'] else 'None'}
-
-### Suggestions
-{chr(10).join(f'- {suggestion}' for suggestion in analysis['suggestions']) if analysis['suggestions'] else 'None'}
-
-### Score: {analysis['score']}/100
-"""
+        requirements_content = _REQUIREMENTS_TEMPLATE.format(
+            component_name=component_name,
+            wcag_level=analyzer.config['wcag_level'],
+            issues='\n'.join(f'- {issue}' for issue in analysis['issues']) or 'None',
+            suggestions='\n'.join(f'- {suggestion}' for suggestion in analysis['suggestions']) or 'None',
+            score=analysis['score']
+        )
         
         req_path = Path(f'.claude/a11y-requirements/{component_name}.md')
-        req_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        with open(req_path, 'w') as f:
-            f.write(requirements_content)
-        
-        print(f"\n✅ Generated requirements: {req_path}", file=sys.stderr)
+        if _write_if_changed(req_path, requirements_content):
+            out.append(f"\n✅ Generated requirements: {req_path}\n")
+        else:
+            out.append(f"\n✅ Requirements up to date: {req_path}\n")
         
         # Generate tests
         tests = analyzer.generate_a11y_tests(component_name)
         test_path = Path(f'tests/a11y/{component_name}.a11y.test.tsx')
-        test_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        with open(test_path, 'w') as f:
-            f.write(tests)
-        
-        print(f"✅ Generated tests: {test_path}", file=sys.stderr)
+        if _write_if_changed(test_path, tests):
+            out.append(f"✅ Generated tests: {test_path}\n")
+        else:
+            out.append(f"✅ Tests up to date: {test_path}\n")
         
         # Block if score too low
         if not analysis['passing']:
@@ -408,14 +470,17 @@ Suggestions:
 {chr(10).join(f'• {suggestion}' for suggestion in analysis['suggestions'])}
 
 Would you like me to add the necessary accessibility features?"""
-            print(message, file=sys.stderr)
+            out.append(message + "\n")
+            sys.stderr.write(''.join(out))
             sys.exit(2)  # Block operation
         
-        print("\n✅ Accessibility check passed! Component can be created.", file=sys.stderr)
+        out.append("\n✅ Accessibility check passed! Component can be created.\n")
+        sys.stderr.write(''.join(out))
         
     except Exception as e:
         # Log error to stderr and continue
-        print(f"A11y enforcer hook error: {str(e)}", file=sys.stderr)
+        out.append(f"A11y enforcer hook error: {str(e)}\n")
+        sys.stderr.write(''.join(out))
         sys.exit(1)
 
 if __name__ == "__main__":
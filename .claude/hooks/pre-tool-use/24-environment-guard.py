@@ -4,72 +4,56 @@ Environment Guard Hook - Prevents dangerous operations based on environment
 Blocks destructive operations in production, warns in staging
 """
 
-import json
+import atexit
 import sys
 import os
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent.parent / 'utils'))
+from hook_io import read_input, dumps
+from hook_patterns import DESTRUCTIVE_RES, SENSITIVE_RE
+
+_EDIT_TOOLS = frozenset(('Write', 'Edit', 'MultiEdit'))
+
+# Append handles kept open for the life of the process, closed at exit
+_LOG_HANDLES = {}
+
+def _log(path, line):
+    """Append a line to a log file, reusing one handle per path"""
+    handle = _LOG_HANDLES.get(path)
+    if handle is None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        handle = _LOG_HANDLES[path] = open(path, 'a', buffering=8192)
+        atexit.register(handle.close)
+    handle.write(line)
+
 def get_current_environment():
     """Get the current environment from NODE_ENV"""
     return os.environ.get('NODE_ENV', 'development')
 
 def is_destructive_operation(tool_name, tool_input):
     """Check if the operation is potentially destructive"""
-    destructive_patterns = {
-        'Bash': [
-            'rm -rf', 'rm -f',
-            'DROP TABLE', 'DROP DATABASE',
-            'TRUNCATE', 'DELETE FROM',
-            'git push --force',
-            'npm publish',
-            ':>/dev/null',
-            'dd if=',
-        ],
-        'Write': [
-            '.env.production',
-            'prod.env',
-            'production.env',
-        ],
-        'Delete': True,  # All delete operations are destructive
-    }
-    
     if tool_name == 'Delete':
         return True
     
-    if tool_name in destructive_patterns:
-        patterns = destructive_patterns[tool_name]
-        if isinstance(patterns, bool):
-            return patterns
-            
-        command = tool_input.get('command', '') if tool_name == 'Bash' else ''
-        file_path = tool_input.get('file_path', tool_input.get('path', ''))
-        
-        for pattern in patterns:
-            if pattern in command or pattern in file_path:
-                return True
+    pattern = DESTRUCTIVE_RES.get(tool_name)
+    if pattern is None:
+        return False
+    
+    command = tool_input.get('command', '') if tool_name == 'Bash' else ''
+    file_path = tool_input.get('file_path', tool_input.get('path', ''))
     
-    return False
+    return bool(pattern.search(command) or pattern.search(file_path))
 
 def is_sensitive_file(file_path):
     """Check if the file contains sensitive information"""
-    sensitive_patterns = [
-        '.env',
-        'secrets',
-        'credentials',
-        'key',
-        'token',
-        '.pem',
-        '.key',
-        'config.production',
-    ]
-    
-    return any(pattern in file_path.lower() for pattern in sensitive_patterns)
+    return SENSITIVE_RE.search(file_path.lower()) is not None
 
 def main():
     """Main hook logic"""
     try:
         # Read input from Claude Code
-        input_data = json.loads(sys.stdin.read())
+        input_data = read_input()
         
         # Extract tool information
         tool_name = input_data.get('tool_name', '')
@@ -92,16 +76,16 @@ def main():
                               "2. Test the operation thoroughly\n"
                               "3. Use proper deployment procedures"
                 }
-                print(json.dumps(error_msg))
+                print(dumps(error_msg))
                 sys.exit(1)
             
             # Check for sensitive file modifications
-            if tool_name in ['Write', 'Edit', 'MultiEdit']:
+            if tool_name in _EDIT_TOOLS:
                 file_path = tool_input.get('file_path', tool_input.get('path', ''))
                 if is_sensitive_file(file_path):
                     # Log the attempt
-                    with open('.claude/logs/production-attempts.log', 'a') as f:
-                        f.write(f"Attempted to modify {file_path} in production\n")
+                    _log(Path('.claude/logs/production-attempts.log'),
+                         f"Attempted to modify {file_path} in production\n")
                     
                     error_msg = {
                         "action": "block",
@@ -109,7 +93,7 @@ def main():
                                   "Sensitive files cannot be modified directly in production.\n"
                                   "Use environment variables or deployment procedures."
                     }
-                    print(json.dumps(error_msg))
+                    print(dumps(error_msg))
                     sys.exit(1)
         
         # Staging environment warnings
@@ -123,16 +107,12 @@ def main():
                               "Make sure you have backups if needed.\n"
                               "This would be BLOCKED in production."
                 }
-                print(json.dumps(warning_msg))
+                print(dumps(warning_msg))
                 sys.exit(0)
         
         # Log all operations by environment
-        log_dir = Path('.claude/logs/environments')
-        log_dir.mkdir(parents=True, exist_ok=True)
-        
-        log_file = log_dir / f"{env}-operations.log"
-        with open(log_file, 'a') as f:
-            f.write(f"{tool_name}: {json.dumps(tool_input)}\n")
+        log_file = Path(f'.claude/logs/environments/{env}-operations.log')
+        _log(log_file, f"{tool_name}: {dumps(tool_input)}\n")
         
         # Allow operation to proceed
         sys.exit(0)
@@ -143,7 +123,7 @@ def main():
             "action": "allow",
             "message": f"Environment guard error: {str(e)}"
         }
-        print(json.dumps(error_output))
+        print(dumps(error_output))
         sys.exit(1)
 
 if __name__ == '__main__':
@@ -4,12 +4,16 @@ Deployment Validator Hook - Ensures code is production-ready before deployment
 Checks for console.logs, proper error handling, and environment variables
 """
 
-import json
 import sys
-import re
 import os
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent.parent / 'utils'))
+from hook_io import read_input, dumps
+from hook_patterns import CONSOLE_RE, ASYNC_RE, TRY_RE, ENV_PATTERNS
+
+_EDIT_TOOLS = frozenset(('Write', 'Edit', 'MultiEdit'))
+
 def check_console_logs(content, file_path):
     """Check for console.log statements in production code"""
     if not file_path.endswith(('.ts', '.tsx', '.js', '.jsx')):
@@ -21,14 +25,13 @@ def check_console_logs(content, file_path):
     if '.test.' in file_path or '.spec.' in file_path:
         return violations
     
-    # Find console.log statements
-    console_pattern = r'console\.(log|debug|info|warn|error|trace)\s*\('
-    
-    for i, line in enumerate(content.split('\n'), 1):
-        if re.search(console_pattern, line):
-            # Check if it's commented out
-            if not line.strip().startswith('//') and not line.strip().startswith('*'):
-                violations.append(f"Line {i}: Console statement found")
+    # Find console.log statements, skipping commented-out lines
+    line_num = 1
+    pos = 0
+    for match in CONSOLE_RE.finditer(content):
+        line_num += content.count('\n', pos, match.start())
+        pos = match.start()
+        violations.append(f"Line {line_num}: Console statement found")
     
     return violations
 
@@ -39,13 +42,9 @@ def check_error_handling(content, file_path):
     
     violations = []
     
-    # Check for async functions without try-catch
-    async_pattern = r'async\s+(?:function\s+)?(?:\w+\s*)?\([^)]*\)\s*(?::\s*[^{]+)?\s*{'
-    try_pattern = r'\btry\s*{'
-    
     # Simple check: count async functions and try blocks
-    async_count = len(re.findall(async_pattern, content))
-    try_count = len(re.findall(try_pattern, content))
+    async_count = sum(1 for _ in ASYNC_RE.finditer(content))
+    try_count = sum(1 for _ in TRY_RE.finditer(content))
     
     if async_count > 0 and try_count < async_count:
         violations.append(f"Found {async_count} async functions but only {try_count} try-catch blocks")
@@ -63,21 +62,12 @@ def check_env_variables(content, file_path):
     
     violations = []
     
-    # Patterns for hardcoded values
-    patterns = {
-        'API URLs': r'https?://(?:localhost|127\.0\.0\.1|api\.|backend\.)',
-        'API Keys': r'[\'"][a-zA-Z0-9]{32,}[\'"]',
-        'Secrets': r'(?:secret|key|token|password)\s*[:=]\s*[\'"][^\'"\s]+[\'"]',
-        'Database URLs': r'(?:postgresql|mysql|mongodb)://[^\'"\s]+',
-    }
-    
-    for name, pattern in patterns.items():
-        matches = re.findall(pattern, content, re.IGNORECASE)
-        if matches:
+    for name, pattern in ENV_PATTERNS.items():
+        for match in pattern.finditer(content):
             # Skip if it's already using process.env
-            for match in matches:
-                if 'process.env' not in content[max(0, content.find(match)-50):content.find(match)]:
-                    violations.append(f"Hardcoded {name}: {match[:30]}...")
+            start = match.start()
+            if 'process.env' not in content[max(0, start-50):start]:
+                violations.append(f"Hardcoded {name}: {match.group()[:30]}...")
     
     return violations
 
@@ -89,7 +79,7 @@ def check_deployment_readiness(tool_name, tool_input):
     if env == 'development' and 'deploy' not in tool_name.lower():
         return None
     
-    if tool_name not in ['Write', 'Edit', 'MultiEdit']:
+    if tool_name not in _EDIT_TOOLS:
         return None
     
     file_path = tool_input.get('file_path', tool_input.get('path', ''))
@@ -114,9 +104,13 @@ def check_deployment_readiness(tool_name, tool_input):
 
 def main():
     """Main hook logic"""
+    # Development edits are never validated; skip reading stdin entirely
+    if os.environ.get('NODE_ENV', 'development') == 'development':
+        sys.exit(0)
+    
     try:
         # Read input from Claude Code
-        input_data = json.loads(sys.stdin.read())
+        input_data = read_input()
         
         # Extract tool information
         tool_name = input_data.get('tool_name', '')
@@ -137,7 +131,7 @@ def main():
                               "\n".join(f"• {v}" for v in violations) +
                               "\n\nFix these issues before deploying to production."
                 }
-                print(json.dumps(error_msg))
+                print(dumps(error_msg))
                 sys.exit(1)
             else:
                 # Warn in other environments
@@ -148,7 +142,7 @@ def main():
                               ("\n... and more" if len(violations) > 5 else "") +
                               "\n\nConsider fixing these before deployment."
                 }
-                print(json.dumps(warning_msg))
+                print(dumps(warning_msg))
         
         # Allow operation to proceed
         sys.exit(0)
@@ -159,7 +153,7 @@ def main():
             "action": "allow",
             "message": f"Deployment validator error: {str(e)}"
         }
-        print(json.dumps(error_output))
+        print(dumps(error_output))
         sys.exit(1)
 
 if __name__ == '__main__':
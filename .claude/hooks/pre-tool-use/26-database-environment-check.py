@@ -4,25 +4,35 @@ Database Environment Check Hook - Prevents cross-environment database access
 Validates connection strings and blocks production data exports
 """
 
-import json
 import sys
 import os
 import re
-from urllib.parse import urlparse
 
-def parse_database_url(url):
-    """Parse database URL to extract components"""
-    try:
-        parsed = urlparse(url)
-        return {
-            'scheme': parsed.scheme,
-            'host': parsed.hostname,
-            'port': parsed.port,
-            'database': parsed.path.lstrip('/'),
-            'user': parsed.username,
-        }
-    except:
-        return None
+# Add utils directory to path for the shared hook I/O helpers
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'utils'))
+from hook_io import read_input, dumps
+
+# Database URLs or SQL table references in a command
+_DB_RE = re.compile(
+    r'(?:DATABASE_URL|postgresql://|mysql://|mongodb://)[^\s\'\"]{1,2048}|(?:FROM|INTO|UPDATE|DELETE\s+FROM)\s+(\w+)',
+    re.IGNORECASE
+)
+# Commands that dump or copy data out of a database; the SELECT/COPY clauses
+# stay within one statement of bounded length so the search is linear
+_EXPORT_RE = re.compile(
+    r'pg_dump|mysqldump|mongodump|SELECT[^;\n]{0,1024}INTO OUTFILE|COPY[^;\n]{0,1024}TO|\.dump|--export|backup',
+    re.IGNORECASE
+)
+
+# Substrings of a lowercased command that indicate a schema migration
+_MIGRATION_PATTERNS = (
+    'migrate',
+    'migration',
+    'db:push',
+    'db:migrate',
+    'prisma migrate',
+    'drizzle',
+)
 
 def get_env_database_patterns():
     """Get expected database patterns for each environment"""
@@ -53,8 +63,7 @@ def check_database_environment_match(command, current_env):
     patterns = get_env_database_patterns()
     
     # Extract database references from command
-    db_pattern = r'(?:DATABASE_URL|postgresql://|mysql://|mongodb://)[^\s\'\"]+|(?:FROM|INTO|UPDATE|DELETE FROM)\s+(\w+)'
-    matches = re.findall(db_pattern, command, re.IGNORECASE)
+    matches = _DB_RE.findall(command)
     
     if not matches:
         return True  # No database operations found
@@ -74,41 +83,18 @@ def check_database_environment_match(command, current_env):
 
 def is_data_export_command(command):
     """Check if command is attempting to export data"""
-    export_patterns = [
-        r'pg_dump',
-        r'mysqldump',
-        r'mongodump',
-        r'SELECT.*INTO OUTFILE',
-        r'COPY.*TO',
-        r'\.dump',
-        r'--export',
-        r'backup',
-    ]
-    
-    for pattern in export_patterns:
-        if re.search(pattern, command, re.IGNORECASE):
-            return True
-    
-    return False
+    return _EXPORT_RE.search(command) is not None
 
 def is_migration_command(command):
     """Check if this is a migration command"""
-    migration_patterns = [
-        'migrate',
-        'migration',
-        'db:push',
-        'db:migrate',
-        'prisma migrate',
-        'drizzle',
-    ]
-    
-    return any(pattern in command.lower() for pattern in migration_patterns)
+    command_lower = command.lower()
+    return any(pattern in command_lower for pattern in _MIGRATION_PATTERNS)
 
 def main():
     """Main hook logic"""
     try:
         # Read input from Claude Code
-        input_data = json.loads(sys.stdin.read())
+        input_data = read_input()
         
         # Extract tool information
         tool_name = input_data.get('tool_name', '')
@@ -134,7 +120,7 @@ def main():
                           "• Data inconsistencies\n\n"
                           "Please use the correct database URL for your environment."
             }
-            print(json.dumps(error_msg))
+            print(dumps(error_msg))
             sys.exit(1)
         
         # Check for data exports in production
@@ -149,7 +135,7 @@ def main():
                           "3. Use staging environment with sanitized data\n"
                           "4. Contact security team for approved exports"
             }
-            print(json.dumps(error_msg))
+            print(dumps(error_msg))
             sys.exit(1)
         
         # Check for migrations in production
@@ -165,7 +151,7 @@ def main():
                           "✓ Maintenance window scheduled?\n\n"
                           "Type 'yes' to confirm you've completed the checklist."
             }
-            print(json.dumps(warning_msg))
+            print(dumps(warning_msg))
             sys.exit(0)
         
         # Allow operation to proceed
@@ -177,7 +163,7 @@ def main():
             "action": "allow",
             "message": f"Database environment check error: {str(e)}"
         }
-        print(json.dumps(error_output))
+        print(dumps(error_output))
         sys.exit(1)
 
 if __name__ == '__main__':
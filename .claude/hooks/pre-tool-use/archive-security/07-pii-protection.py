@@ -4,10 +4,13 @@ PII Protection Hook - Prevent PII exposure in logs, URLs, and client storage
 Ensures compliance with privacy regulations
 """
 
-import json
 import sys
+import os
 import re
-from pathlib import Path
+
+# Add utils directory to path for the shared hook I/O helpers
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'utils'))
+from hook_io import read_input
 
 # Common PII field patterns
 PII_PATTERNS = [
@@ -21,57 +24,106 @@ PII_PATTERNS = [
     'ip_address', 'user_id', 'customer_id'
 ]
 
+# Tools whose input carries file content
+_EDIT_TOOLS = frozenset(('Write', 'Edit', 'MultiEdit'))
+# Violation types that block the write
+_CRITICAL_TYPES = frozenset(('console_log', 'localStorage', 'url_params'))
+# Enough findings to block and explain the write
+_MAX_VIOLATIONS = 50
+
+# Every PII field name in one scan; the lookahead keeps fields nested in
+# longer ones (name inside first_name) visible
+_PII_FIELD_RE = re.compile('(?=(' + '|'.join(map(re.escape, PII_PATTERNS)) + '))')
+# Sinks that expose a line's data
+_CONSOLE_RE = re.compile(r'console\.(?:log|error|warn)')
+_STORAGE_RE = re.compile(r'localstorage|sessionstorage', re.IGNORECASE)
+
+# PII passed through URL query strings, reported per matching pattern
+_URL_PATTERNS = [
+    (pattern, re.compile(pattern, re.IGNORECASE)) for pattern in [
+        r'[?&]email=',
+        r'[?&]phone=',
+        r'[?&]ssn=',
+        r'[?&]name=',
+        r'[?&]address=',
+        r'searchParams\.set\([\'"](?:email|phone|ssn|name)',
+        r'searchParams\.append\([\'"](?:email|phone|ssn|name)'
+    ]
+]
+# Any of the above, so lines without URL parameters are rejected in one search
+_URL_PARAM_RE = re.compile('|'.join(pattern for pattern, _ in _URL_PATTERNS), re.IGNORECASE)
+# Anything a line must contain for one of the checks to fire; a superset of them
+_SINK_RE = re.compile(
+    r'console\.(?:log|error|warn)|localstorage|sessionstorage|' + _URL_PARAM_RE.pattern,
+    re.IGNORECASE
+)
+
+def _pii_fields(line_lower):
+    """PII field names found in a lowercased line, in PII_PATTERNS order"""
+    found = set(_PII_FIELD_RE.findall(line_lower))
+    return [field for field in PII_PATTERNS if field in found]
+
+def _sink_lines(content):
+    """Yield (line number, line) for each line with a sink, without splitting the whole content"""
+    line_num = 1
+    line_start = 0
+    line_end = -1
+    for match in _SINK_RE.finditer(content):
+        start = match.start()
+        if start < line_end:
+            continue  # Line already yielded
+        line_num += content.count('\n', line_start, start)
+        line_start = content.rfind('\n', 0, start) + 1
+        line_end = content.find('\n', start)
+        if line_end < 0:
+            line_end = len(content)
+        yield line_num, content[line_start:line_end]
+
 def check_file_content(content, file_path):
     """Check file content for PII violations"""
     violations = []
-    lines = content.split('\n')
+    seen = set()
     
-    for line_num, line in enumerate(lines, 1):
-        line_lower = line.lower()
-        
-        # Check console.log with PII
-        if any(console in line for console in ['console.log', 'console.error', 'console.warn']):
-            for field in PII_PATTERNS:
-                if field in line_lower:
-                    violations.append({
-                        'type': 'console_log',
-                        'line': line_num,
-                        'field': field,
-                        'content': line.strip()[:80]
-                    })
+    def add(v_type, line_num, key, value, line):
+        # Each field or pattern is reported once per type, on its first line
+        if (v_type, value) in seen:
+            return
+        seen.add((v_type, value))
+        violations.append({
+            'type': v_type,
+            'line': line_num,
+            key: value,
+            'content': line.strip()[:80]
+        })
+    
+    # Lines without a console, storage or URL sink cannot produce a violation
+    for line_num, line in _sink_lines(content):
+        if len(violations) >= _MAX_VIOLATIONS:
+            break
         
-        # Check localStorage/sessionStorage
-        if 'localstorage' in line_lower or 'sessionstorage' in line_lower:
-            for field in PII_PATTERNS:
-                if field in line_lower:
-                    violations.append({
-                        'type': 'localStorage',
-                        'line': line_num,
-                        'field': field,
-                        'content': line.strip()[:80]
-                    })
+        is_console = _CONSOLE_RE.search(line) is not None
+        is_storage = _STORAGE_RE.search(line) is not None
         
-        # Check URL parameters
-        url_patterns = [
-            r'[?&]email=',
-            r'[?&]phone=',
-            r'[?&]ssn=',
-            r'[?&]name=',
-            r'[?&]address=',
-            r'searchParams\.set\([\'"](?:email|phone|ssn|name)',
-            r'searchParams\.append\([\'"](?:email|phone|ssn|name)'
-        ]
+        if is_console or is_storage:
+            fields = _pii_fields(line.lower())
+            
+            # Check console.log with PII
+            if is_console:
+                for field in fields:
+                    add('console_log', line_num, 'field', field, line)
+            
+            # Check localStorage/sessionStorage
+            if is_storage:
+                for field in fields:
+                    add('localStorage', line_num, 'field', field, line)
         
-        for pattern in url_patterns:
-            if re.search(pattern, line, re.IGNORECASE):
-                violations.append({
-                    'type': 'url_params',
-                    'line': line_num,
-                    'pattern': pattern,
-                    'content': line.strip()[:80]
-                })
+        # Check URL parameters; most lines miss the combined pattern
+        if _URL_PARAM_RE.search(line):
+            for pattern, compiled in _URL_PATTERNS:
+                if compiled.search(line):
+                    add('url_params', line_num, 'pattern', pattern, line)
     
-    return violations
+    return violations[:_MAX_VIOLATIONS]
 
 def format_violation_message(violations):
     """Format violations into readable message"""
@@ -89,18 +141,24 @@ def format_violation_message(violations):
         message += "❌ PII in Console Logs:\n"
         for v in by_type['console_log'][:3]:
             message += f"  Line {v['line']}: Logging {v['field']} field\n"
+        if len(by_type['console_log']) > 3:
+            message += f"  ... and {len(by_type['console_log']) - 3} more\n"
     
     # localStorage violations
     if 'localStorage' in by_type:
         message += "\n❌ PII in Client Storage:\n"
         for v in by_type['localStorage'][:3]:
             message += f"  Line {v['line']}: Storing {v['field']} in localStorage\n"
+        if len(by_type['localStorage']) > 3:
+            message += f"  ... and {len(by_type['localStorage']) - 3} more\n"
     
     # URL violations
     if 'url_params' in by_type:
         message += "\n❌ PII in URLs:\n"
         for v in by_type['url_params'][:3]:
             message += f"  Line {v['line']}: PII in URL parameters\n"
+        if len(by_type['url_params']) > 3:
+            message += f"  ... and {len(by_type['url_params']) - 3} more\n"
     
     message += "\n📚 Security Rules:\n"
     message += "  • Never log PII to console\n"
@@ -114,13 +172,13 @@ def main():
     """Main hook logic"""
     try:
         # Read input from Claude Code
-        input_data = json.loads(sys.stdin.read())
+        input_data = read_input()
         
         # Extract tool name
         tool_name = input_data.get('tool_name', '')
         
         # Only check write operations
-        if tool_name not in ['Write', 'Edit', 'MultiEdit']:
+        if tool_name not in _EDIT_TOOLS:
             sys.exit(0)
         
         # Extract tool input
@@ -128,7 +186,7 @@ def main():
         file_path = tool_input.get('file_path', tool_input.get('path', ''))
         
         # Only check code files
-        if not any(file_path.endswith(ext) for ext in ['.ts', '.tsx', '.js', '.jsx']):
+        if not file_path.endswith(('.ts', '.tsx', '.js', '.jsx')):
             sys.exit(0)
             
         content = tool_input.get('content', tool_input.get('new_str', ''))
@@ -144,8 +202,7 @@ def main():
             message = format_violation_message(violations)
             
             # For critical violations (PII in logs/storage), block
-            critical_types = ['console_log', 'localStorage', 'url_params']
-            has_critical = any(v['type'] in critical_types for v in violations)
+            has_critical = any(v['type'] in _CRITICAL_TYPES for v in violations)
             
             if has_critical:
                 # Block using official format: stderr + exit code 2
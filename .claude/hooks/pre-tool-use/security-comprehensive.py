@@ -4,11 +4,103 @@ Comprehensive Security Validator Hook
 Consolidates PII protection, TCPA compliance, and general security validation
 """
 
-import json
 import sys
+import os
+import socket
+import struct
+
+def _recv_exact(sock, size):
+    """Read exactly size bytes from a socket"""
+    data = bytearray()
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError('security validator worker closed the connection')
+        data += chunk
+    return bytes(data)
+
+def _validate_remote(sock_path, payload):
+    """Validate a raw hook payload through the worker on sock_path; messages are length-prefixed"""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(5)
+        sock.connect(sock_path)
+        sock.sendall(struct.pack('>I', len(payload)) + payload)
+        size, = struct.unpack('>I', _recv_exact(sock, 4))
+        return _recv_exact(sock, size).decode()
+
+# With a worker running (CLAUDE_SEC_SOCK), forward the payload untouched before
+# any patterns are compiled; the worker does the whole check
+_PAYLOAD = None
+if __name__ == '__main__' and os.environ.get('CLAUDE_SEC_SOCK') and '--serve' not in sys.argv:
+    _PAYLOAD = sys.stdin.buffer.read()
+    try:
+        print(_validate_remote(os.environ['CLAUDE_SEC_SOCK'], _PAYLOAD))
+        sys.exit(0)
+    except (OSError, struct.error):
+        pass  # Fall back to validating in-process
+
 import re
+import bisect
+import time
+import hashlib
 from pathlib import Path
 
+# Add utils directory to path for the shared hook I/O helpers
+sys.path.insert(0, str(Path(__file__).parent.parent / 'utils'))
+from hook_io import read_input, loads, dumps
+
+# Validation results keyed by a digest of the operation, sharded by prefix
+_CACHE_DIR = Path('.claude/cache/security-validator')
+_CACHE_TTL = 24 * 60 * 60
+# Bump when the rules change so stale results are not replayed
+_CACHE_VERSION = b'4'
+
+# Generated, minified or asset files that are never hand-written code
+_SKIP_SUFFIXES = (
+    '.min.js', '.min.css', '.map', '.lock',
+    'package-lock.json', 'pnpm-lock.yaml',
+)
+# Content over _SCAN_MAX_BYTES (UTF-8) is scanned as its first and last
+# _SCAN_SAMPLE_CHARS characters only
+try:
+    _SCAN_MAX_BYTES = int(os.environ.get('PII_SCAN_MAX_BYTES', 512 * 1024))
+except ValueError:
+    _SCAN_MAX_BYTES = 512 * 1024
+_SCAN_SAMPLE_CHARS = 64 * 1024
+
+def _exceeds_scan_limit(content):
+    """Whether content's UTF-8 size is over _SCAN_MAX_BYTES"""
+    # Every character is at least one byte, so only content short enough
+    # in characters needs encoding to be measured
+    return len(content) > _SCAN_MAX_BYTES or len(content.encode()) > _SCAN_MAX_BYTES
+
+# Substrings a line needs for any PII check to fire: console, URL, storage, form input
+_SINK_RE = re.compile(r'console\.|[?&]|searchParams|URLSearchParams|localStorage|sessionStorage|type="text"')
+
+# Per-line conditions, each one search instead of a loop over literals
+_URL_HINT_RE = re.compile(r'[?&]|searchParams|URLSearchParams')
+_URL_PARAM_RE = re.compile(r'\.set\(|\.append\(|[?&]|searchParams')
+_STORAGE_RE = re.compile(r'localStorage|sessionStorage')
+_SAFE_LOG_RE = re.compile(r'process\.env\.NODE_ENV|development|debug|// TODO: Remove')
+_SENSITIVE_INPUT_RE = re.compile(r'ssn|social|credit|card')
+_MUTATING_METHOD_RE = re.compile(r'POST|PUT|DELETE')
+
+def _sink_lines(content):
+    """Yield (line number, line) for each line with a sink, without splitting the whole content"""
+    line_num = 1
+    line_start = 0
+    line_end = -1
+    for match in _SINK_RE.finditer(content):
+        start = match.start()
+        if start < line_end:
+            continue  # Line already yielded
+        line_num += content.count('\n', line_start, start)
+        line_start = content.rfind('\n', 0, start) + 1
+        line_end = content.find('\n', start)
+        if line_end < 0:
+            line_end = len(content)
+        yield line_num, content[line_start:line_end]
+
 class SecurityValidator:
     """Comprehensive security validation hook"""
     
@@ -24,6 +116,16 @@ class SecurityValidator:
         'ip_address', 'user_id', 'customer_id',
         'password', 'secret', 'api_key', 'token'
     ]
+    # All PII fields in one scan; the lookahead keeps nested fields
+    # (name inside first_name) visible
+    PII_FIELD_RE = re.compile('(?=(' + '|'.join(map(re.escape, PII_FIELDS)) + '))')
+    # Violation type, message template and severity for each PII sink
+    PII_SINK_RULES = (
+        ('pii_in_console', 'Potential PII ({}) in console.log', 'high'),
+        ('pii_in_url', 'PII ({}) exposed in URL parameters', 'high'),
+        ('pii_in_storage', 'PII ({}) stored in browser storage', 'critical'),
+    )
+    MAX_PII_VIOLATIONS = 50
     
     # TCPA messaging keywords
     MESSAGING_KEYWORDS = [
@@ -32,6 +134,14 @@ class SecurityValidator:
         'sms', 'text message', 'notification',
         'phone', 'mobile', 'cellular'
     ]
+    # Terms showing each required TCPA element is handled; plain substring
+    # checks outrun a regex alternation for lists this short
+    CONSENT_TERMS = ['consent', 'opt-in', 'optin', 'permission', 'subscribe']
+    OPT_OUT_TERMS = ['opt-out', 'optout', 'unsubscribe', 'stop', 'cancel']
+    TIME_RESTRICTION_TERMS = [
+        'business hours', 'time restriction', 'allowed hours',
+        'quiet hours', 'do not disturb'
+    ]
     
     # Security patterns
     SECURITY_PATTERNS = {
@@ -42,10 +152,16 @@ class SecurityValidator:
         'dangerouslySetInnerHTML': r'dangerouslySetInnerHTML',
         'sql_injection': r'(SELECT|INSERT|UPDATE|DELETE).+\+.*["\']',
     }
+    # Compiled once at class load rather than looked up per call
+    COMPILED_SECURITY_PATTERNS = {
+        pattern_name: re.compile(pattern, re.IGNORECASE | re.MULTILINE)
+        for pattern_name, pattern in SECURITY_PATTERNS.items()
+    }
     
     def __init__(self):
         self.violations = []
         self.warnings = []
+        self.pii_capped = False
     
     def validate(self, operation):
         """Main validation entry point"""
@@ -53,64 +169,78 @@ class SecurityValidator:
         file_path = operation.get('path', '')
         tool = operation.get('tool', '')
         
+        # Huge files are sampled at both ends; lines in the tail are numbered from the cut
+        truncated = _exceeds_scan_limit(content)
+        if truncated:
+            content = content[:_SCAN_SAMPLE_CHARS] + '\n' + content[-_SCAN_SAMPLE_CHARS:]
+        
         # Run all security checks
         self.check_pii_protection(content, file_path)
         self.check_tcpa_compliance(content, file_path)
         self.check_general_security(content, file_path, tool)
         
+        # An unscanned middle must not read as a clean pass
+        if truncated:
+            self.warnings.append({
+                'type': 'partial_scan',
+                'message': f'File exceeds {_SCAN_MAX_BYTES} bytes; only its first and last '
+                           f'{_SCAN_SAMPLE_CHARS} characters were scanned',
+                'severity': 'medium'
+            })
+        
         # Return results
         if self.violations:
-            return self.format_response(False)
+            result = self.format_response(False)
         elif self.warnings:
-            return self.format_response(True, warnings=True)
+            result = self.format_response(True, warnings=True)
         else:
-            return {'approved': True}
+            result = {'approved': True}
+        
+        if truncated:
+            result['truncated'] = True
+        if self.pii_capped:
+            result['pii_capped'] = True
+        return result
     
     def check_pii_protection(self, content, file_path):
         """Check for PII exposure risks"""
-        lines = content.split('\n')
+        seen = set()
         
-        for line_num, line in enumerate(lines, 1):
+        # Lines without a sink cannot produce a violation or warning
+        for line_num, line in _sink_lines(content):
             line_lower = line.lower()
             
-            # Check console.log with PII
-            if 'console.' in line:
-                for pii_field in self.PII_FIELDS:
-                    if pii_field in line_lower and not self.is_safe_log(line):
-                        self.violations.append({
-                            'type': 'pii_in_console',
-                            'line': line_num,
-                            'field': pii_field,
-                            'message': f'Potential PII ({pii_field}) in console.log',
-                            'severity': 'high'
-                        })
-            
-            # Check URL parameters with PII
-            if any(pattern in line for pattern in ['?', '&', 'searchParams', 'URLSearchParams']):
-                for pii_field in self.PII_FIELDS:
-                    if pii_field in line_lower and self.is_url_param(line):
-                        self.violations.append({
-                            'type': 'pii_in_url',
-                            'line': line_num,
-                            'field': pii_field,
-                            'message': f'PII ({pii_field}) exposed in URL parameters',
-                            'severity': 'high'
-                        })
+            # Sinks are cheap to test; PII fields are only scanned for on lines that hit one
+            in_console = 'console.' in line and not self.is_safe_log(line)
+            in_url = _URL_HINT_RE.search(line) is not None and self.is_url_param(line)
+            in_storage = _STORAGE_RE.search(line) is not None
             
-            # Check localStorage/sessionStorage
-            if any(storage in line for storage in ['localStorage', 'sessionStorage']):
-                for pii_field in self.PII_FIELDS:
-                    if pii_field in line_lower:
+            if in_console or in_url or in_storage:
+                found = set(self.PII_FIELD_RE.findall(line_lower))
+                fields = [field for field in self.PII_FIELDS if field in found]
+                
+                # Each field is reported once per sink, on its first line
+                for (v_type, message, severity), hit in zip(self.PII_SINK_RULES, (in_console, in_url, in_storage)):
+                    if not hit:
+                        continue
+                    for pii_field in fields:
+                        if (v_type, pii_field) in seen:
+                            continue
+                        # Stop once enough PII findings have been collected to act on
+                        if len(self.violations) >= self.MAX_PII_VIOLATIONS:
+                            self.pii_capped = True
+                            return
+                        seen.add((v_type, pii_field))
                         self.violations.append({
-                            'type': 'pii_in_storage',
+                            'type': v_type,
                             'line': line_num,
                             'field': pii_field,
-                            'message': f'PII ({pii_field}) stored in browser storage',
-                            'severity': 'critical'
+                            'message': message.format(pii_field),
+                            'severity': severity
                         })
             
             # Check form fields for proper masking
-            if 'type="text"' in line and any(pii in line_lower for pii in ['ssn', 'social', 'credit', 'card']):
+            if 'type="text"' in line and _SENSITIVE_INPUT_RE.search(line_lower):
                 self.warnings.append({
                     'type': 'unmasked_sensitive_field',
                     'line': line_num,
@@ -128,18 +258,9 @@ class SecurityValidator:
             return
         
         # Required TCPA elements
-        has_consent_check = any(term in content_lower for term in [
-            'consent', 'opt-in', 'optin', 'permission', 'subscribe'
-        ])
-        
-        has_opt_out = any(term in content_lower for term in [
-            'opt-out', 'optout', 'unsubscribe', 'stop', 'cancel'
-        ])
-        
-        has_time_restriction = any(term in content_lower for term in [
-            'business hours', 'time restriction', 'allowed hours',
-            'quiet hours', 'do not disturb'
-        ])
+        has_consent_check = any(term in content_lower for term in self.CONSENT_TERMS)
+        has_opt_out = any(term in content_lower for term in self.OPT_OUT_TERMS)
+        has_time_restriction = any(term in content_lower for term in self.TIME_RESTRICTION_TERMS)
         
         # Check for violations
         if not has_consent_check:
@@ -177,13 +298,18 @@ class SecurityValidator:
         if '<form' in content or 'Form' in content:
             self.check_form_security(content)
         
+        # Newline offsets and the first 'production' mention, found once for all matches
+        newlines = [match.start() for match in re.finditer('\n', content)]
+        production_at = content.find('production')
+        
         # General patterns
-        for pattern_name, pattern in self.SECURITY_PATTERNS.items():
-            matches = re.finditer(pattern, content, re.IGNORECASE | re.MULTILINE)
-            for match in matches:
-                line_num = content[:match.start()].count('\n') + 1
+        for pattern_name, pattern in self.COMPILED_SECURITY_PATTERNS.items():
+            for match in pattern.finditer(content):
+                line_num = bisect.bisect_right(newlines, match.start()) + 1
                 
-                if pattern_name == 'console_log' and 'production' not in content[:match.start()]:
+                # 'production' appears before the match only if its first occurrence ends by then
+                before_production = production_at < 0 or production_at + len('production') > match.start()
+                if pattern_name == 'console_log' and before_production:
                     self.warnings.append({
                         'type': 'console_in_production',
                         'line': line_num,
@@ -215,7 +341,7 @@ class SecurityValidator:
     def check_api_security(self, content):
         """Check API route security"""
         # Rate limiting
-        if 'rateLimit' not in content and any(method in content for method in ['POST', 'PUT', 'DELETE']):
+        if 'rateLimit' not in content and _MUTATING_METHOD_RE.search(content):
             self.violations.append({
                 'type': 'missing_rate_limit',
                 'message': 'API route missing rate limiting',
@@ -260,22 +386,11 @@ class SecurityValidator:
     
     def is_safe_log(self, line):
         """Check if console.log is safe (e.g., in development only)"""
-        return any(safe in line for safe in [
-            'process.env.NODE_ENV',
-            'development',
-            'debug',
-            '// TODO: Remove'
-        ])
+        return _SAFE_LOG_RE.search(line) is not None
     
     def is_url_param(self, line):
         """Check if line contains URL parameter assignment"""
-        return any(pattern in line for pattern in [
-            '.set(',
-            '.append(',
-            '?',
-            '&',
-            'searchParams'
-        ])
+        return _URL_PARAM_RE.search(line) is not None
     
     def format_response(self, approved, warnings=False):
         """Format the validation response"""
@@ -297,11 +412,86 @@ class SecurityValidator:
             return {'approved': True}
 
 # Hook entry point
-def main():
-    operation = json.loads(sys.stdin.read())
+def _cache_path(operation):
+    """Cache file for an operation's path and content"""
+    digest = hashlib.blake2b(_CACHE_VERSION, digest_size=16)
+    digest.update(str(_SCAN_MAX_BYTES).encode())
+    digest.update(operation.get('path', '').encode())
+    digest.update(b'\0')
+    digest.update(operation.get('content', '').encode())
+    key = digest.hexdigest()
+    return _CACHE_DIR / key[:2] / key
+
+def _prune_cache_shard(shard):
+    """Delete expired results from one cache shard, so each write sweeps 1/256 of the cache"""
+    cutoff = time.time() - _CACHE_TTL
+    with os.scandir(shard) as entries:
+        for entry in entries:
+            try:
+                if entry.stat().st_mtime < cutoff:
+                    os.unlink(entry.path)
+            except OSError:
+                pass  # Removed by a concurrent hook
+
+def _check(operation):
+    """Validation result for an operation as a JSON string"""
+    # Generated and asset files are approved without scanning
+    if operation.get('path', '').endswith(_SKIP_SUFFIXES):
+        return dumps({'approved': True})
+    
+    # Replay the result for content validated within the last day
+    cache_path = _cache_path(operation)
+    try:
+        if time.time() - cache_path.stat().st_mtime < _CACHE_TTL:
+            return cache_path.read_text()
+    except OSError:
+        pass
+    
     validator = SecurityValidator()
-    result = validator.validate(operation)
-    print(json.dumps(result))
+    result = dumps(validator.validate(operation))
+    
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        _prune_cache_shard(cache_path.parent)
+        cache_path.write_text(result)
+    except OSError:
+        pass
+    return result
+
+def serve(sock_path):
+    """Run a worker that keeps the compiled validator warm across hook calls"""
+    import asyncio
+    
+    async def handle(reader, writer):
+        try:
+            while True:
+                size, = struct.unpack('>I', await reader.readexactly(4))
+                result = _check(loads(await reader.readexactly(size))).encode()
+                writer.write(struct.pack('>I', len(result)) + result)
+                await writer.drain()
+        except asyncio.IncompleteReadError:
+            pass
+        finally:
+            writer.close()
+    
+    async def run():
+        if os.path.exists(sock_path):
+            os.unlink(sock_path)
+        server = await asyncio.start_unix_server(handle, path=sock_path)
+        async with server:
+            await server.serve_forever()
+    
+    asyncio.run(run())
+
+def main():
+    # python security-comprehensive.py --serve <socket> runs the worker
+    if len(sys.argv) == 3 and sys.argv[1] == '--serve':
+        serve(sys.argv[2])
+        return
+    
+    # The payload was already read if forwarding to a worker failed
+    operation = read_input() if _PAYLOAD is None else loads(_PAYLOAD)
+    print(_check(operation))
 
 if __name__ == '__main__':
     main()
@@ -3,11 +3,14 @@
 Save Transcript Hook - Saves conversation transcript when session ends
 """
 
-import json
 import sys
 import os
+import time
 from pathlib import Path
-from datetime import datetime
+
+# Add utils directory to path for the shared hook I/O helpers
+sys.path.insert(0, str(Path(__file__).parent.parent / 'utils'))
+from hook_io import read_input
 
 def save_transcript():
     """Save the current session transcript"""
@@ -16,16 +19,24 @@ def save_transcript():
         transcript_dir = Path(".claude/transcripts")
         transcript_dir.mkdir(parents=True, exist_ok=True)
         
+        # One clock reading serves both the filename and the marker text
+        secs, ns = divmod(time.time_ns(), 1_000_000_000)
+        now = time.localtime(secs)
+        micros = ns // 1000
+        ended_at = time.strftime("%Y-%m-%dT%H:%M:%S", now) + (f".{micros:06d}" if micros else "")
+        
         # Generate filename with timestamp
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = time.strftime("%Y%m%d_%H%M%S", now)
         filename = f"transcript_{timestamp}.txt"
         filepath = transcript_dir / filename
         
         # Note: In a real implementation, we would capture the actual transcript
-        # For now, we just create a marker file
-        with open(filepath, 'w') as f:
-            f.write(f"Session ended at {datetime.now().isoformat()}\n")
-            f.write(f"Session ID: {os.getenv('CLAUDE_SESSION_ID', 'unknown')}\n")
+        # For now, we just create a marker file, written in one call
+        payload = (
+            f"Session ended at {ended_at}\n"
+            f"Session ID: {os.getenv('CLAUDE_SESSION_ID', 'unknown')}\n"
+        )
+        filepath.write_bytes(payload.encode())
         
         return True
     except Exception as e:
@@ -39,7 +50,7 @@ def main():
         input_data = {}
         if not sys.stdin.isatty():
             try:
-                input_data = json.loads(sys.stdin.read())
+                input_data = read_input()
             except:
                 pass
         
@@ -3,20 +3,27 @@
 Browser State Save Hook - Capture browser state for handoffs
 """
 
-import json
 import sys
 import os
+import time
 from pathlib import Path
-from datetime import datetime
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'utils'))
+from hook_io import read_input, dumps_indented
 
 BROWSER_STATE_PATH = Path('.claude/state/browser-state.json')
 
 def save_browser_state(state_data):
     """Save browser state for handoff"""
+    # One clock reading serves the state timestamp and the gist description
+    secs, ns = divmod(time.time_ns(), 1_000_000_000)
+    now = time.localtime(secs)
+    micros = ns // 1000
+    
     BROWSER_STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
     
     browser_state = {
-        'timestamp': datetime.now().isoformat(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S', now) + (f'.{micros:06d}' if micros else ''),
         'session_id': os.environ.get('CLAUDE_SESSION_ID', 'unknown'),
         'active_tests': state_data.get('active_tests', []),
         'last_errors': state_data.get('console_errors', []),
@@ -26,17 +33,17 @@ def save_browser_state(state_data):
         'performance_metrics': state_data.get('performance', {})
     }
     
-    # Save to file
-    with open(BROWSER_STATE_PATH, 'w') as f:
-        json.dump(browser_state, f, indent=2)
+    # Save to file; the same encoding is embedded in the gist below
+    state_json = dumps_indented(browser_state)
+    BROWSER_STATE_PATH.write_bytes(state_json)
     
     # Also save to gist for team sharing
     gist_path = Path('.claude/state/browser-state-gist.json')
     gist_data = {
-        'description': f'Browser test state - {datetime.now().strftime("%Y-%m-%d %H:%M")}',
+        'description': f'Browser test state - {time.strftime("%Y-%m-%d %H:%M", now)}',
         'files': {
             'browser-state.json': {
-                'content': json.dumps(browser_state, indent=2)
+                'content': state_json.decode()
             },
             'test-report.md': {
                 'content': generate_test_report(browser_state)
@@ -44,8 +51,7 @@ def save_browser_state(state_data):
         }
     }
     
-    with open(gist_path, 'w') as f:
-        json.dump(gist_data, f, indent=2)
+    gist_path.write_bytes(dumps_indented(gist_data))
 
 def generate_test_report(state):
     """Generate markdown test report"""
@@ -79,7 +85,7 @@ def main():
     try:
         # Read any state data from stdin
         if not sys.stdin.isatty():
-            input_data = json.loads(sys.stdin.read())
+            input_data = read_input()
         else:
             input_data = {}
         
@@ -109,11 +115,14 @@ def main():
             # Save state
             save_browser_state(state_data)
             
-            print("✅ Browser state saved!")
-            print("   - Test scenarios preserved")
-            print("   - Visual baselines saved")
-            print("   - Coverage metrics recorded")
-            print("\nNext developer can resume with: /pw-resume")
+            # Success summary in a single write
+            sys.stdout.write(
+                "✅ Browser state saved!\n"
+                "   - Test scenarios preserved\n"
+                "   - Visual baselines saved\n"
+                "   - Coverage metrics recorded\n"
+                "\nNext developer can resume with: /pw-resume\n"
+            )
         
         sys.exit(0)
         
@@ -5,8 +5,6 @@ knowledge-share - Minimal working version
 
 import json
 import sys
-import os
-from pathlib import Path
 
 def main():
     """Main hook logic"""
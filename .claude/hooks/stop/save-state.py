@@ -5,8 +5,6 @@ Save State Hook - Saves session state when Claude Code stops
 
 import json
 import sys
-import os
-from pathlib import Path
 
 def main():
     """Main hook logic"""
@@ -6,8 +6,6 @@ Saves security status when session ends
 
 import json
 import sys
-import os
-from pathlib import Path
 
 def main():
     """Main hook logic"""
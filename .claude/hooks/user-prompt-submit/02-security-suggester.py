@@ -6,76 +6,83 @@ Suggests security-related commands based on user input
 
 import json
 import sys
-import os
-from pathlib import Path
 
-def analyze_security_intent(prompt):
-    """Analyze if user prompt relates to security"""
-    security_keywords = [
-        'security', 'secure', 'auth', 'authentication', 'authorization',
-        'password', 'encrypt', 'decrypt', 'token', 'jwt', 'oauth',
-        'vulnerability', 'exploit', 'injection', 'xss', 'csrf',
-        'rate limit', 'dos', 'ddos', 'brute force',
-        'audit', 'compliance', 'gdpr', 'pci', 'hipaa',
-        'api key', 'secret', 'credential', 'certificate',
-        'firewall', 'cors', 'csp', 'hsts', 'ssl', 'tls',
-        'pentest', 'penetration', 'scan', 'scanner'
-    ]
-    
-    prompt_lower = prompt.lower()
-    return any(keyword in prompt_lower for keyword in security_keywords)
+# Substrings that mark a prompt as security related
+SECURITY_KEYWORDS = (
+    'security', 'secure', 'auth', 'authentication', 'authorization',
+    'password', 'encrypt', 'decrypt', 'token', 'jwt', 'oauth',
+    'vulnerability', 'exploit', 'injection', 'xss', 'csrf',
+    'rate limit', 'dos', 'ddos', 'brute force',
+    'audit', 'compliance', 'gdpr', 'pci', 'hipaa',
+    'api key', 'secret', 'credential', 'certificate',
+    'firewall', 'cors', 'csp', 'hsts', 'ssl', 'tls',
+    'pentest', 'penetration', 'scan', 'scanner'
+)
 
-def get_security_suggestions(prompt):
-    """Get relevant security command suggestions"""
-    suggestions = []
-    prompt_lower = prompt.lower()
-    
+# Trigger words and the commands they suggest, in suggestion order
+SUGGESTION_RULES = (
     # API security
-    if any(word in prompt_lower for word in ['api', 'endpoint', 'route']):
-        suggestions.append({
+    (('api', 'endpoint', 'route'), (
+        {
             'command': '/create-secure-api',
             'description': 'Create API with built-in security features'
-        })
-        suggestions.append({
+        },
+        {
             'command': '/security-check api',
             'description': 'Audit API routes for security issues'
-        })
-    
+        },
+    )),
     # Form security
-    if any(word in prompt_lower for word in ['form', 'input', 'submission']):
-        suggestions.append({
+    (('form', 'input', 'submission'), (
+        {
             'command': '/create-secure-form',
             'description': 'Create form with security best practices'
-        })
-        suggestions.append({
+        },
+        {
             'command': '/audit-form-security',
             'description': 'Check forms for security vulnerabilities'
-        })
-    
+        },
+    )),
     # General security audit
-    if any(word in prompt_lower for word in ['audit', 'check', 'scan', 'vulnerability']):
-        suggestions.append({
+    (('audit', 'check', 'scan', 'vulnerability'), (
+        {
             'command': '/security-audit',
             'description': 'Run comprehensive security audit'
-        })
-        suggestions.append({
+        },
+        {
             'command': '/dependency-scan',
             'description': 'Scan dependencies for vulnerabilities'
-        })
-    
+        },
+    )),
     # Authentication
-    if any(word in prompt_lower for word in ['auth', 'login', 'session']):
-        suggestions.append({
+    (('auth', 'login', 'session'), (
+        {
             'command': '/enhance-security auth',
             'description': 'Add authentication security features'
-        })
-    
+        },
+    )),
     # RLS / Database security
-    if any(word in prompt_lower for word in ['database', 'rls', 'policy', 'supabase']):
-        suggestions.append({
+    (('database', 'rls', 'policy', 'supabase'), (
+        {
             'command': '/generate-rls',
             'description': 'Generate Row Level Security policies'
-        })
+        },
+    )),
+)
+
+def analyze_security_intent(prompt):
+    """Analyze if user prompt relates to security"""
+    prompt_lower = prompt.lower()
+    return any(keyword in prompt_lower for keyword in SECURITY_KEYWORDS)
+
+def get_security_suggestions(prompt):
+    """Get relevant security command suggestions"""
+    suggestions = []
+    prompt_lower = prompt.lower()
+    
+    for keywords, commands in SUGGESTION_RULES:
+        if any(word in prompt_lower for word in keywords):
+            suggestions.extend(commands)
     
     return suggestions
 
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Hook I/O - Reads hook payloads from stdin and serializes hook responses
+Uses orjson when it is installed, falling back to the standard json module
+"""
+
+import json
+import sys
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def read_input():
+    """Parse the JSON hook payload from stdin"""
+    if orjson is not None:
+        return orjson.loads(sys.stdin.buffer.read())
+    return json.loads(sys.stdin.read())
+
+def loads(data):
+    """Parse a JSON document from bytes or str"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def dumps(obj):
+    """Serialize a hook response to a JSON string"""
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj)
+
+def dumps_indented(obj):
+    """Serialize a document as two-space indented JSON bytes for writing to disk"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode()
+
+def dumps_line(obj):
+    """Serialize a record as one compact JSON Lines entry"""
+    if orjson is not None:
+        return orjson.dumps(obj) + b'\n'
+    return json.dumps(obj, separators=(',', ':')).encode() + b'\n'
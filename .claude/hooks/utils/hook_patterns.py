@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Hook Patterns - Compiled regular expressions shared by the pre-tool-use hooks
+Imported once per process so each pattern is compiled a single time
+"""
+
+import re
+
+# --- Accessibility (23-a11y-enforcer) ---
+
+# Markup elements, found in one pass; lookaheads keep overlapping tags visible
+ELEMENT_RE = re.compile(
+    r'<(?:(?=(?P<button>button[^>]*>))|(?=(?P<link>a[^>]*>))|(?=(?P<img>img[^>]*>))'
+    r'|(?=(?P<input>input[^>]*>))|(?=h(?P<heading>\d)))'
+)
+# Plain-text signals consumed by the keyboard, focus and screen reader checks
+SIGNAL_RE = re.compile(
+    r'(?P<onclick>onClick)|(?P<onkeydown>onKeyDown)|(?P<onkeypress>onKeyPress)|(?P<pos_tabindex>tabIndex=["\']?[1-9])|(?P<tabindex>tabIndex)'
+    r'|(?P<state>setState|useState)|(?P<aria_live>aria-live)|(?P<modal>Modal|Dialog)'
+    r'|(?P<blur>blur)|(?P<focus_style>focus:)|(?P<focus_visible>focusVisible)|(?P<focus>(?i:focus))'
+)
+BTN_TEXT_RE = re.compile(r'>\s*\w+')
+# Markers that identify UI component code
+UI_RE = re.compile(r'<button|<input|<select|<form|<a |onClick|className=')
+# Landmark roles or elements that aid screen reader navigation
+LANDMARK_RE = re.compile(r'role="main"|role="navigation"|<main|<nav')
+LOW_CONTRAST = (
+    (re.compile(r'text-gray-[3-4]00.*bg-white'), "Light gray text on white background"),
+    (re.compile(r'text-white.*bg-gray-[1-3]00'), "White text on light background"),
+    (re.compile(r'text-yellow.*bg-white'), "Yellow text on white background")
+)
+
+# --- Environment guard (24-environment-guard) ---
+
+# Substrings that mark an operation as destructive, per tool
+DESTRUCTIVE_PATTERNS = {
+    'Bash': [
+        'rm -rf', 'rm -f',
+        'DROP TABLE', 'DROP DATABASE',
+        'TRUNCATE', 'DELETE FROM',
+        'git push --force',
+        'npm publish',
+        ':>/dev/null',
+        'dd if=',
+    ],
+    'Write': [
+        '.env.production',
+        'prod.env',
+        'production.env',
+    ],
+    'Delete': True,  # All delete operations are destructive
+}
+
+# One alternation per tool so each input is scanned once
+DESTRUCTIVE_RES = {
+    tool: re.compile('|'.join(map(re.escape, patterns)))
+    for tool, patterns in DESTRUCTIVE_PATTERNS.items()
+    if isinstance(patterns, list)
+}
+
+# Path fragments of files holding secrets or production config
+SENSITIVE_RE = re.compile(r'\.env|secrets|credentials|key|token|\.pem|config\.production')
+
+# --- Deployment validator (25-deployment-validator) ---
+
+# A console call on a line that is not a // or * comment
+CONSOLE_RE = re.compile(
+    r'^(?![^\S\n]*(?://|\*))[^\n]*?console\.(?:log|debug|info|warn|error|trace)[^\S\n]*\(',
+    re.MULTILINE
+)
+ASYNC_RE = re.compile(r'async\s+(?:function\s+)?(?:\w+\s*)?\([^)]*\)\s*(?::\s*[^{]+)?\s*{')
+TRY_RE = re.compile(r'\btry\s*{')
+
+# Hardcoded values that belong in environment variables
+ENV_PATTERNS = {
+    'API URLs': re.compile(r'https?://(?:localhost|127\.0\.0\.1|api\.|backend\.)', re.IGNORECASE),
+    'API Keys': re.compile(r'[\'"][a-zA-Z0-9]{32,}[\'"]', re.IGNORECASE),
+    'Secrets': re.compile(r'(?:secret|key|token|password)\s*[:=]\s*[\'"][^\'"\s]+[\'"]', re.IGNORECASE),
+    'Database URLs': re.compile(r'(?:postgresql|mysql|mongodb)://[^\'"\s]+', re.IGNORECASE),
+}
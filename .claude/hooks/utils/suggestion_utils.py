@@ -4,17 +4,65 @@ Suggestion System Utilities
 Shared utilities for command suggestion and decision logic
 """
 
-import json
+import os
+import re
+import time
+from collections import Counter
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Optional, Any
 
+from hook_io import loads
+
+# Parsed state files and directory listings, keyed by path and reused
+# while the path's st_mtime_ns is unchanged
+_JSON_CACHE: Dict[str, tuple] = {}
+_GLOB_CACHE: Dict[Path, tuple] = {}
+
+def _load_json(path) -> Any:
+    """Parse a JSON file or DirEntry, reusing the previous parse if it has not changed."""
+    mtime = path.stat().st_mtime_ns
+    key = os.fspath(path)
+    cached = _JSON_CACHE.get(key)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    with open(path, 'rb') as f:
+        data = loads(f.read())
+    _JSON_CACHE[key] = (mtime, data)
+    return data
+
+def _markdown_files(directory: Path) -> List[Path]:
+    """List a directory's *.md files, rescanning only when its entries change."""
+    mtime = os.stat(directory).st_mtime_ns
+    cached = _GLOB_CACHE.get(directory)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    files = list(directory.glob('*.md'))
+    _GLOB_CACHE[directory] = (mtime, files)
+    return files
+
 class ContextLoader:
     """Centralized context loading for all suggestion systems."""
     
+    # Project paths checked on every load, relative to the working directory
+    PROJECT_MARKERS = (
+        Path('docs') / 'project' / 'PROJECT_PRD.md',
+        Path('.claude') / 'project-config.json',
+        Path('package.json')
+    )
+    PRD_DIRS = (
+        Path('docs') / 'prds',
+        Path('PRDs'),
+        Path('docs') / 'project'
+    )
+    PRP_ACTIVE_DIR = Path('PRPs') / 'active'
+    
     @staticmethod
     def load_full_context() -> Dict[str, Any]:
         """Load comprehensive context from all sources."""
+        # One clock reading, so the time flags agree with each other
+        now = datetime.now()
+        
         context = {
             # Project state
             'is_new_project': False,
@@ -43,98 +91,93 @@ class ContextLoader:
             'command_history': [],
             
             # Time context
-            'is_morning': datetime.now().hour < 10,
-            'is_evening': datetime.now().hour >= 17,
-            'is_weekend': datetime.now().weekday() >= 5
+            'is_morning': now.hour < 10,
+            'is_evening': now.hour >= 17,
+            'is_weekend': now.weekday() >= 5
         }
         
+        # One directory scan tells the loaders which state files exist
+        state_files = ContextLoader._scan_state_dir()
+        
         # Load from various sources
         ContextLoader._load_project_state(context)
-        ContextLoader._load_work_state(context)
-        ContextLoader._load_task_state(context)
+        ContextLoader._load_work_state(context, state_files)
+        ContextLoader._load_task_state(context, state_files)
         ContextLoader._load_bug_state(context)
-        ContextLoader._load_user_state(context)
-        
-        print(json.dumps({"action": "continue"}))
+        ContextLoader._load_user_state(context, state_files)
         
         return context
     
+    @staticmethod
+    def _scan_state_dir() -> Dict[str, os.DirEntry]:
+        """Map file names in ~/.claude-code-state to their directory entries."""
+        try:
+            with os.scandir(Path.home() / '.claude-code-state') as entries:
+                return {entry.name: entry for entry in entries}
+        except OSError:
+            return {}
+    
     @staticmethod
     def _load_project_state(context: Dict):
         """Check project initialization state."""
         # Check for project markers
-        project_markers = [
-            Path('.') / 'docs' / 'project' / 'PROJECT_PRD.md',
-            Path('.') / '.claude' / 'project-config.json',
-            Path('.') / 'package.json'
-        ]
-        
-        context['is_new_project'] = not any(p.exists() for p in project_markers)
+        context['is_new_project'] = not any(p.exists() for p in ContextLoader.PROJECT_MARKERS)
         
         # Check for PRDs
-        prd_dirs = [
-            Path('.') / 'docs' / 'prds',
-            Path('.') / 'PRDs',
-            Path('.') / 'docs' / 'project'
-        ]
-        for prd_dir in prd_dirs:
-            if prd_dir.exists() and list(prd_dir.glob('*.md')):
-                context['has_prd'] = True
-                break
+        for prd_dir in ContextLoader.PRD_DIRS:
+            try:
+                if _markdown_files(prd_dir):
+                    context['has_prd'] = True
+                    break
+            except OSError:
+                pass
         
         # Check for PRPs
-        prp_active = Path('.') / 'PRPs' / 'active'
-        if prp_active.exists():
-            prps = list(prp_active.glob('*.md'))
+        try:
+            prps = _markdown_files(ContextLoader.PRP_ACTIVE_DIR)
+        except OSError:
+            prps = None
+        if prps is not None:
             context['has_prp'] = len(prps) > 0
             context['active_prps'] = [p.stem for p in prps]
             if prps:
                 context['current_prp'] = prps[0].stem
     
     @staticmethod
-    def _load_work_state(context: Dict):
+    def _load_work_state(context: Dict, state_files: Dict[str, os.DirEntry]):
         """Load current work state."""
-        state_dir = Path.home() / '.claude-code-state'
-        
         # Current work
-        work_file = state_dir / 'current_work.json'
-        if work_file.exists():
+        work_file = state_files.get('current_work.json')
+        if work_file is not None:
             try:
-                with open(work_file) as f:
-                    work = json.load(f)
-                    context['current_issue'] = work.get('issue_number')
-                    context['current_branch'] = work.get('branch_name')
-                    context['current_feature'] = work.get('feature_name')
+                work = _load_json(work_file)
+                context['current_issue'] = work.get('issue_number')
+                context['current_branch'] = work.get('branch_name')
+                context['current_feature'] = work.get('feature_name')
             except:
                 pass
         
         # GitHub issues
-        issues_file = state_dir / 'github_issues.json'
-        context['has_issues'] = issues_file.exists()
+        context['has_issues'] = 'github_issues.json' in state_files
     
     @staticmethod
-    def _load_task_state(context: Dict):
+    def _load_task_state(context: Dict, state_files: Dict[str, os.DirEntry]):
         """Load task information."""
-        state_dir = Path.home() / '.claude-code-state'
-        tasks_file = state_dir / 'tasks.json'
+        tasks_file = state_files.get('tasks.json')
         
-        if tasks_file.exists():
+        if tasks_file is not None:
             try:
-                with open(tasks_file) as f:
-                    data = json.load(f)
-                    tasks = data.get('tasks', [])
-                    
-                    context['has_tasks'] = len(tasks) > 0
-                    context['total_tasks'] = len(tasks)
-                    context['completed_tasks'] = len([t for t in tasks 
-                                                    if t.get('status') == 'completed'])
-                    
-                    # Group by domain
-                    domains = {}
-                    for task in tasks:
-                        domain = task.get('domain', 'general')
-                        domains[domain] = domains.get(domain, 0) + 1
-                    context['tasks_by_domain'] = domains
+                data = _load_json(tasks_file)
+                tasks = data.get('tasks', [])
+                
+                context['has_tasks'] = len(tasks) > 0
+                context['total_tasks'] = len(tasks)
+                context['completed_tasks'] = len([t for t in tasks 
+                                                if t.get('status') == 'completed'])
+                
+                # Group by domain
+                domains = Counter([task.get('domain', 'general') for task in tasks])
+                context['tasks_by_domain'] = dict(domains)
             except:
                 pass
     
@@ -142,42 +185,37 @@ class ContextLoader:
     def _load_bug_state(context: Dict):
         """Load bug tracking state."""
         bugs_file = Path('.') / '.claude' / 'bugs' / 'bugs.json'
-        if bugs_file.exists():
-            try:
-                with open(bugs_file) as f:
-                    data = json.load(f)
-                    bugs = data.get('bugs', [])
-                    context['open_bugs'] = len([b for b in bugs 
-                                              if b.get('status') == 'open'])
-            except:
-                pass
+        try:
+            data = _load_json(bugs_file)
+            bugs = data.get('bugs', [])
+            context['open_bugs'] = len([b for b in bugs 
+                                      if b.get('status') == 'open'])
+        except:
+            pass
     
     @staticmethod
-    def _load_user_state(context: Dict):
+    def _load_user_state(context: Dict, state_files: Dict[str, os.DirEntry]):
         """Analyze user state and patterns."""
-        state_dir = Path.home() / '.claude-code-state'
-        
         # Command history
-        cmd_log = state_dir / 'command_log.json'
-        if cmd_log.exists():
+        cmd_log = state_files.get('command_log.json')
+        if cmd_log is not None:
             try:
-                with open(cmd_log) as f:
-                    log = json.load(f)
-                    commands = log.get('commands', [])
+                log = _load_json(cmd_log)
+                commands = log.get('commands', [])
+                
+                if commands:
+                    # Last command time
+                    last_cmd = commands[-1]
+                    context['last_command_time'] = last_cmd.get('timestamp')
                     
-                    if commands:
-                        # Last command time
-                        last_cmd = commands[-1]
-                        context['last_command_time'] = last_cmd.get('timestamp')
-                        
-                        # Check if stuck
-                        if context['last_command_time']:
-                            last_time = datetime.fromisoformat(context['last_command_time'])
-                            elapsed = (datetime.now() - last_time).seconds
-                            context['appears_stuck'] = elapsed > 300  # 5 minutes
-                        
-                        # Recent command history
-                        context['command_history'] = [c['command'] for c in commands[-10:]]
+                    # Check if stuck; the log is rewritten with each command,
+                    # so its mtime is the last command time
+                    if context['last_command_time']:
+                        elapsed = time.time() - cmd_log.stat().st_mtime
+                        context['appears_stuck'] = elapsed > 300  # 5 minutes
+                    
+                    # Recent command history
+                    context['command_history'] = [c['command'] for c in commands[-10:]]
             except:
                 pass
 
@@ -185,37 +223,36 @@ class ContextLoader:
 class ComplexityAnalyzer:
     """Analyze task/feature complexity."""
     
+    # Complexity indicators, matched as substrings of the lowercased text
+    INDICATORS = {
+        'complex': [
+            'research', 'figure out', 'investigate', 'explore',
+            'architecture', 'design', 'integration', 'ml', 'ai',
+            'real-time', 'distributed', 'scale', 'optimize',
+            'multiple options', 'approaches', 'complex', 'unclear'
+        ],
+        'medium': [
+            'implement', 'enhance', 'refactor', 'migrate',
+            'api', 'database', 'authentication', 'workflow',
+            'form', 'ui component', 'validation', 'testing'
+        ],
+        'simple': [
+            'fix', 'typo', 'rename', 'update', 'add button',
+            'change color', 'text', 'label', 'minor', 'quick'
+        ]
+    }
+    
     @staticmethod
     def analyze(text: str) -> str:
         """Return complexity level: simple, medium, complex."""
         if not text:
-            print(json.dumps({"action": "continue"}))
             return 'simple'
         
         text_lower = text.lower()
         
-        # Complexity indicators
-        indicators = {
-            'complex': [
-                'research', 'figure out', 'investigate', 'explore',
-                'architecture', 'design', 'integration', 'ml', 'ai',
-                'real-time', 'distributed', 'scale', 'optimize',
-                'multiple options', 'approaches', 'complex', 'unclear'
-            ],
-            'medium': [
-                'implement', 'enhance', 'refactor', 'migrate',
-                'api', 'database', 'authentication', 'workflow',
-                'form', 'ui component', 'validation', 'testing'
-            ],
-            'simple': [
-                'fix', 'typo', 'rename', 'update', 'add button',
-                'change color', 'text', 'label', 'minor', 'quick'
-            ]
-        }
-        
         # Score each level
         scores = {}
-        for level, keywords in indicators.items():
+        for level, keywords in ComplexityAnalyzer.INDICATORS.items():
             scores[level] = sum(1 for kw in keywords if kw in text_lower)
         
         # Length factor
@@ -225,7 +262,6 @@ class ComplexityAnalyzer:
             scores['simple'] += 1
         
         # Return highest scoring level
-        print(json.dumps({"action": "continue"}))
         return max(scores.keys(), key=lambda k: scores[k])
 
 
@@ -236,18 +272,15 @@ class OrchestrationCalculator:
     def should_suggest_orchestration(tasks: List[Dict]) -> bool:
         """Determine if orchestration would help."""
         if len(tasks) < 5:
-            print(json.dumps({"action": "continue"}))
             return False
         
         domains = set(task.get('domain', 'general') for task in tasks)
-        print(json.dumps({"action": "continue"}))
         return len(domains) >= 2
     
     @staticmethod
     def calculate_optimal_agents(tasks: List[Dict]) -> int:
         """Calculate optimal number of agents."""
         domains = set(task.get('domain', 'general') for task in tasks)
-        print(json.dumps({"action": "continue"}))
         return min(len(domains), 5)
     
     @staticmethod
@@ -255,35 +288,42 @@ class OrchestrationCalculator:
         """Estimate time saved in minutes."""
         total_time = sum(task.get('estimated_time', 30) for task in tasks)
         # Assume 30% savings with parallel execution
-        print(json.dumps({"action": "continue"}))
         return int(total_time * 0.3)
 
 
 class SuggestionConflictChecker:
     """Check for conflicts with other hooks."""
     
+    # Markers left in a result by hooks that already made suggestions
+    SUGGESTION_RE = re.compile(
+        r'orchestration_suggestion|suggested_persona|[Nn]ext steps:|Recommended:|Suggestion:'
+    )
+    
     @staticmethod
     def has_existing_suggestions(result: Any) -> bool:
         """Check if suggestions already provided."""
         if not result:
-            print(json.dumps({"action": "continue"}))
             return False
         
-        result_str = str(result)
-        
-        # Check for existing suggestions
-        suggestion_indicators = [
-            'orchestration_suggestion',
-            'suggested_persona',
-            'Next steps:',
-            'next steps:',
-            'Recommended:',
-            'Suggestion:'
-        ]
-        
-        print(json.dumps({"action": "continue"}))
-        
-        return any(indicator in result_str for indicator in suggestion_indicators)
+        # Search each key and value rather than str() of the whole result,
+        # stopping at the first marker
+        search = SuggestionConflictChecker.SUGGESTION_RE.search
+        return any(search(text) for text in SuggestionConflictChecker._texts(result))
+    
+    @staticmethod
+    def _texts(obj: Any):
+        """Yield the strings in a result, walking dicts and sequences."""
+        if isinstance(obj, str):
+            yield obj
+        elif isinstance(obj, dict):
+            for key, value in obj.items():
+                yield from SuggestionConflictChecker._texts(key)
+                yield from SuggestionConflictChecker._texts(value)
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            for item in obj:
+                yield from SuggestionConflictChecker._texts(item)
+        else:
+            yield str(obj)
 
 
 class CommandMappings:
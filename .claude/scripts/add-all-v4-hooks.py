@@ -44,7 +44,7 @@ def update_settings():
     # Find PreToolUse hooks
     for hook_group in settings['hooks']['PreToolUse']:
         if hook_group['matcher'] == "":
-            existing_commands = [h['command'] for h in hook_group['hooks']]
+            existing_commands = {h['command'] for h in hook_group['hooks']}
             
             # Add new hooks if not already present
             for new_hook in new_hooks:
@@ -4,6 +4,7 @@ Add error recovery hook to PostToolUse
 """
 
 import json
+import os
 from pathlib import Path
 
 def update_settings():
@@ -22,7 +23,7 @@ def update_settings():
     # Find PostToolUse hooks
     for hook_group in settings['hooks']['PostToolUse']:
         if hook_group['matcher'] == "":
-            existing_commands = [h['command'] for h in hook_group['hooks']]
+            existing_commands = {h['command'] for h in hook_group['hooks']}
             
             # Add at the beginning for early error detection
             if new_hook['command'] not in existing_commands:
@@ -30,8 +31,12 @@ def update_settings():
                 print(f"✅ Added: {new_hook['command'].split('/')[-1]}")
     
     # Write updated settings
-    with open(settings_path, 'w') as f:
+    # Write to a temp file and swap it in, so an interrupted run never
+    # leaves a truncated settings.json
+    tmp_path = settings_path.with_suffix('.json.tmp')
+    with open(tmp_path, 'w') as f:
         json.dump(settings, f, indent=2)
+    os.replace(tmp_path, settings_path)
     
     print(f"✅ Updated settings.json with error recovery hook")
     
@@ -4,6 +4,7 @@ Add multi-tenant-setup chain to chains.json
 """
 
 import json
+import os
 
 # Load chains
 with open('.claude/chains.json', 'r') as f:
@@ -34,9 +35,10 @@ data['chains'].update(new_chain)
 # Add shortcut
 data['shortcuts']['mts'] = 'multi-tenant-setup'
 
-# Save
-with open('.claude/chains.json', 'w') as f:
+# Save through a temp file so an interrupted run never leaves a truncated chains.json
+with open('.claude/chains.json.tmp', 'w') as f:
     json.dump(data, f, indent=2)
+os.replace('.claude/chains.json.tmp', '.claude/chains.json')
 
 print("✅ Added multi-tenant-setup chain")
 print("✅ Added shortcut 'mts'")
@@ -4,6 +4,8 @@ Add v4.0 hooks to Claude settings
 """
 
 import json
+import os
+import shutil
 from pathlib import Path
 
 def update_settings():
@@ -13,6 +15,11 @@ def update_settings():
     with open(settings_path) as f:
         settings = json.load(f)
     
+    # Backup current settings as a byte copy, before anything changes
+    backup_path = settings_path.with_suffix('.json.backup-v3')
+    shutil.copy2(settings_path, backup_path)
+    print(f"📦 Backup created: {backup_path}\n")
+    
     # New v4.0 hooks to add
     new_hooks = [
         {
@@ -32,7 +39,7 @@ def update_settings():
     # Find PreToolUse hooks
     for hook_group in settings['hooks']['PreToolUse']:
         if hook_group['matcher'] == "":
-            existing_commands = [h['command'] for h in hook_group['hooks']]
+            existing_commands = {h['command'] for h in hook_group['hooks']}
             
             # Add new hooks if not already present
             for new_hook in new_hooks:
@@ -42,15 +49,13 @@ def update_settings():
                     hook_group['hooks'].insert(insert_pos, new_hook)
                     print(f"✅ Added: {new_hook['command'].split('/')[-1]}")
     
-    # Backup current settings
-    backup_path = settings_path.with_suffix('.json.backup-v3')
-    with open(backup_path, 'w') as f:
-        json.dump(settings, f, indent=2)
-    print(f"\n📦 Backup created: {backup_path}")
-    
     # Write updated settings
-    with open(settings_path, 'w') as f:
+    # Write to a temp file and swap it in, so an interrupted run never
+    # leaves a truncated settings.json
+    tmp_path = settings_path.with_suffix('.json.tmp')
+    with open(tmp_path, 'w') as f:
         json.dump(settings, f, indent=2)
+    os.replace(tmp_path, settings_path)
     
     print(f"✅ Updated settings.json with v4.0 hooks")
     
@@ -4,20 +4,33 @@ Agent performance monitoring for Claude Code Boilerplate v3.0
 Tracks execution metrics, success rates, and performance trends
 """
 
-import json
+import atexit
 import time
 import sys
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional, Any
-from collections import defaultdict
+from collections import defaultdict, deque
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'hooks' / 'utils'))
+sys.path.insert(0, str(Path(__file__).parent))
+from hook_io import loads, dumps_indented
+from metrics_store import MetricsStore
 
 class AgentMetrics:
+    # Tracked metrics are written once this many are pending or this many
+    # seconds have passed since the last write, and always at exit
+    FLUSH_THRESHOLD = 50
+    FLUSH_INTERVAL = 5.0
+    
     def __init__(self):
         self.metrics_dir = Path(".claude/metrics")
         self.metrics_dir.mkdir(exist_ok=True)
-        self.metrics_file = self.metrics_dir / "v3-performance.json"
+        self.store = MetricsStore(self.metrics_dir)
         self.summary_file = self.metrics_dir / "v3-performance-summary.json"
+        self._pending = deque()
+        self._last_flush = time.monotonic()
+        atexit.register(self.flush)
         
     def track_agent_execution(self, 
                             agent_name: str, 
@@ -38,28 +51,39 @@ class AgentMetrics:
             'version': 'v3.0'
         }
         
-        # Append to metrics file
-        metrics = self._load_metrics()
-        metrics.append(metric)
-        self._save_metrics(metrics)
+        # Buffer the metric; the file and summary are updated per batch
+        self._pending.append(metric)
         
         # Check performance thresholds
         if execution_time > 2.0:
             print(f"⚠️  Performance warning: {agent_name} took {execution_time:.2f}s")
         
-        # Update summary
-        self._update_summary(agent_name, execution_time, success)
+        self._maybe_flush()
+    
+    def _maybe_flush(self):
+        """Flush once enough metrics are pending or enough time has passed"""
+        if (len(self._pending) >= self.FLUSH_THRESHOLD or
+                time.monotonic() - self._last_flush >= self.FLUSH_INTERVAL):
+            self.flush()
+    
+    def flush(self):
+        """Write pending metrics to disk and fold them into the summary"""
+        self._last_flush = time.monotonic()
+        if not self._pending:
+            return
+        
+        metrics = list(self._pending)
+        self._pending.clear()
+        self.store.append(metrics)
+        self._update_summary(metrics)
             
     def generate_report(self, days: int = 7) -> Dict[str, Any]:
         """Generate performance report for the last N days"""
-        metrics = self._load_metrics()
-        cutoff_date = datetime.now() - timedelta(days=days)
-        
-        # Filter recent metrics
-        recent_metrics = [
-            m for m in metrics 
-            if datetime.fromisoformat(m['timestamp']) > cutoff_date
-        ]
+        self.flush()
+        # Timestamps are naive isoformat() strings, which sort chronologically,
+        # so the cutoff is compared as a string instead of parsing every entry
+        cutoff = (datetime.now() - timedelta(days=days)).isoformat()
+        total_executions = 0
         
         # Calculate stats per agent
         agent_stats = defaultdict(lambda: {
@@ -67,7 +91,7 @@ class AgentMetrics:
             'total_time': 0,
             'success_count': 0,
             'error_count': 0,
-            'errors': [],
+            'errors': deque(maxlen=5),
             'p50_time': 0,
             'p95_time': 0,
             'p99_time': 0,
@@ -79,7 +103,12 @@ class AgentMetrics:
         # Collect execution times per agent
         agent_times = defaultdict(list)
         
-        for metric in recent_metrics:
+        # Stream metrics from disk, keeping only the recent ones
+        for metric in self.store.iter_metrics():
+            if metric['timestamp'] <= cutoff:
+                continue
+            
+            total_executions += 1
             agent = metric['agent']
             stats = agent_stats[agent]
             exec_time = metric['execution_time']
@@ -98,9 +127,6 @@ class AgentMetrics:
                         'error': metric['error_message'][:100],
                         'timestamp': metric['timestamp']
                     })
-            
-            stats['max_time'] = max(stats['max_time'], exec_time)
-            stats['min_time'] = min(stats['min_time'], exec_time)
         
         # Calculate percentiles and averages
         for agent, times in agent_times.items():
@@ -108,24 +134,27 @@ class AgentMetrics:
                 continue
                 
             stats = agent_stats[agent]
-            times_sorted = sorted(times)
-            n = len(times_sorted)
+            # Sort in place once; min, max and percentiles all read from it
+            times.sort()
+            n = len(times)
             
             stats['avg_time'] = round(stats['total_time'] / stats['count'], 3)
             stats['success_rate'] = round((stats['success_count'] / stats['count']) * 100, 1)
             
             # Calculate percentiles
-            stats['p50_time'] = round(times_sorted[int(n * 0.5)], 3)
-            stats['p95_time'] = round(times_sorted[int(n * 0.95)], 3)
-            stats['p99_time'] = round(times_sorted[int(n * 0.99)], 3)
+            stats['p50_time'] = round(times[int(n * 0.5)], 3)
+            stats['p95_time'] = round(times[int(n * 0.95)], 3)
+            stats['p99_time'] = round(times[int(n * 0.99)], 3)
+            stats['min_time'] = times[0]
+            stats['max_time'] = times[-1]
             
-            # Clean up errors list (keep last 5)
-            stats['errors'] = stats['errors'][-5:]
+            # The deque kept only the last 5 errors
+            stats['errors'] = list(stats['errors'])
             
         return {
             'report_date': datetime.now().isoformat(),
             'period_days': days,
-            'total_executions': len(recent_metrics),
+            'total_executions': total_executions,
             'agent_stats': dict(agent_stats),
             'performance_summary': self._get_performance_summary(agent_stats)
         }
@@ -237,61 +266,40 @@ class AgentMetrics:
         
         # Save detailed report
         report_file = self.metrics_dir / f"performance-report-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
-        with open(report_file, 'w') as f:
-            json.dump(report, f, indent=2)
+        report_file.write_bytes(dumps_indented(report))
         
         print(f"\n📁 Full report saved to: {report_file}")
     
-    def _load_metrics(self) -> List[Dict]:
-        """Load metrics from file"""
-        if self.metrics_file.exists():
-            try:
-                with open(self.metrics_file) as f:
-                    return json.load(f)
-            except json.JSONDecodeError:
-                print("⚠️  Warning: Corrupted metrics file, starting fresh")
-                return []
-        return []
-    
-    def _save_metrics(self, metrics: List[Dict]):
-        """Save metrics to file"""
-        # Keep only last 10,000 entries to prevent file bloat
-        if len(metrics) > 10000:
-            metrics = metrics[-10000:]
-            
-        with open(self.metrics_file, 'w') as f:
-            json.dump(metrics, f, indent=2)
-    
-    def _update_summary(self, agent_name: str, execution_time: float, success: bool):
-        """Update running summary statistics"""
+    def _update_summary(self, metrics: List[Dict]):
+        """Update running summary statistics with a batch of metrics"""
         summary = {}
         if self.summary_file.exists():
             try:
-                with open(self.summary_file) as f:
-                    summary = json.load(f)
+                summary = loads(self.summary_file.read_bytes())
             except:
                 summary = {}
         
-        if agent_name not in summary:
-            summary[agent_name] = {
-                'total_executions': 0,
-                'total_time': 0,
-                'success_count': 0,
-                'last_execution': None,
-                'last_success': None
-            }
-        
-        agent_summary = summary[agent_name]
-        agent_summary['total_executions'] += 1
-        agent_summary['total_time'] += execution_time
-        agent_summary['last_execution'] = datetime.now().isoformat()
-        
-        if success:
-            agent_summary['success_count'] += 1
-            agent_summary['last_success'] = datetime.now().isoformat()
+        for metric in metrics:
+            agent_name = metric['agent']
+            if agent_name not in summary:
+                summary[agent_name] = {
+                    'total_executions': 0,
+                    'total_time': 0,
+                    'success_count': 0,
+                    'last_execution': None,
+                    'last_success': None
+                }
+            
+            agent_summary = summary[agent_name]
+            agent_summary['total_executions'] += 1
+            agent_summary['total_time'] += metric['execution_time']
+            agent_summary['last_execution'] = metric['timestamp']
+            
+            if metric['success']:
+                agent_summary['success_count'] += 1
+                agent_summary['last_success'] = metric['timestamp']
         
-        with open(self.summary_file, 'w') as f:
-            json.dump(summary, f, indent=2)
+        self.summary_file.write_bytes(dumps_indented(summary))
 
 def main():
     """Main entry point for CLI usage"""
@@ -309,6 +317,7 @@ def main():
             tokens = int(sys.argv[6]) if len(sys.argv) > 6 else None
             
             metrics.track_agent_execution(agent, task, exec_time, success, tokens)
+            metrics.flush()
             print(f"✅ Tracked: {agent} - {exec_time}s - {'Success' if success else 'Failed'}")
             
         elif command == 'report':
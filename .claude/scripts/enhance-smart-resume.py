@@ -10,6 +10,16 @@ from pathlib import Path
 import re
 from datetime import datetime
 
+# Ledger patterns, compiled once; see post-tool-use/15b-task-ledger-updater.py
+# for the format that writes them
+_FEATURES_RE = re.compile(r'\*\*Total Features\*\*: (\d+)')
+_TASKS_RE = re.compile(r'\*\*Active Tasks\*\*: (\d+)')
+_COMPLETED_RE = re.compile(r'\*\*Completed\*\*: (\d+)')
+_IN_PROGRESS_RE = re.compile(r'\*\*In Progress\*\*: (\d+)')
+_FEATURE_HEADING_RE = re.compile(r'^### (.+)$', re.MULTILINE)
+_BRANCH_RE = re.compile(r'^\*\*Branch\*\*: `([^`]+)`', re.MULTILINE)
+_PROGRESS_RE = re.compile(r'^\*\*Progress\*\*: (\d+)/(\d+) tasks', re.MULTILINE)
+
 def get_task_ledger_summary():
     """Extract summary from task ledger."""
     ledger_path = Path('.task-ledger.md')
@@ -20,10 +30,10 @@ def get_task_ledger_summary():
         content = ledger_path.read_text()
         
         # Extract summary stats
-        features_match = re.search(r'\*\*Total Features\*\*: (\d+)', content)
-        tasks_match = re.search(r'\*\*Active Tasks\*\*: (\d+)', content)
-        completed_match = re.search(r'\*\*Completed\*\*: (\d+)', content)
-        in_progress_match = re.search(r'\*\*In Progress\*\*: (\d+)', content)
+        features_match = _FEATURES_RE.search(content)
+        tasks_match = _TASKS_RE.search(content)
+        completed_match = _COMPLETED_RE.search(content)
+        in_progress_match = _IN_PROGRESS_RE.search(content)
         
         features = int(features_match.group(1)) if features_match else 0
         tasks = int(tasks_match.group(1)) if tasks_match else 0
@@ -33,24 +43,26 @@ def get_task_ledger_summary():
         # Get current feature if on feature branch
         current_branch = get_current_branch()
         current_feature = None
-        
-        # Find feature matching branch
-        feature_matches = re.findall(r'### ([^\n]+).*?**Branch**: `([^`]+)`', content, re.DOTALL)
-        for feature, branch in feature_matches:
-            if branch == current_branch:
-                current_feature = feature
-                break
-        
-        # Get progress for current feature
         current_progress = None
-        if current_feature:
-            pattern = rf'### {re.escape(current_feature)}.*?**Progress**: (\d+)/(\d+) tasks'
-            match = re.search(pattern, content, re.DOTALL)
+        
+        # Walk the feature sections once, each bounded by the next heading,
+        # and read branch and progress from the one matching the branch
+        headings = list(_FEATURE_HEADING_RE.finditer(content))
+        for i, heading in enumerate(headings):
+            end = headings[i + 1].start() if i + 1 < len(headings) else len(content)
+            section = content[heading.end():end]
+            branch_match = _BRANCH_RE.search(section)
+            if not branch_match or branch_match.group(1) != current_branch:
+                continue
+            
+            current_feature = heading.group(1)
+            match = _PROGRESS_RE.search(section)
             if match:
                 current_progress = {
                     'completed': int(match.group(1)),
                     'total': int(match.group(2))
                 }
+            break
         
         return {
             'features': features,
@@ -66,6 +78,15 @@ def get_task_ledger_summary():
 
 def get_current_branch():
     """Get current git branch."""
+    # A plain checkout names its branch in .git/HEAD, which saves running git
+    try:
+        head = Path('.git/HEAD').read_text().strip()
+        if head.startswith('ref: refs/heads/'):
+            return head[len('ref: refs/heads/'):]
+    except OSError:
+        pass
+    
+    # Worktrees, detached HEADs and subdirectories go through git itself
     try:
         import subprocess
         result = subprocess.run(['git', 'rev-parse', '--abbrev-ref', 'HEAD'],
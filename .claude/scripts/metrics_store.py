@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Metrics Store - JSON Lines storage for agent performance metrics
+Shared by agent-metrics.py and monitoring/agent-metrics.py, which read and
+write the same v3-performance.jsonl file
+"""
+
+import os
+import sys
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'hooks' / 'utils'))
+from hook_io import loads, dumps_line
+
+class MetricsStore:
+    # Size at which the metrics file is rotated; one previous generation is kept
+    ROTATE_BYTES = 4 * 1024 * 1024
+
+    def __init__(self, metrics_dir: Path):
+        # One JSON record per line, so tracking appends instead of rewriting
+        self.metrics_file = metrics_dir / "v3-performance.jsonl"
+        self.rotated_file = metrics_dir / "v3-performance.jsonl.1"
+        self.legacy_file = metrics_dir / "v3-performance.json"
+        self._migrate_legacy_metrics()
+
+    def iter_metrics(self) -> Iterator[Dict]:
+        """Yield metrics oldest first from the rotated and current files"""
+        for path in (self.rotated_file, self.metrics_file):
+            try:
+                f = open(path, 'rb')
+            except FileNotFoundError:
+                continue
+            with f:
+                for line in f:
+                    try:
+                        yield loads(line)
+                    except ValueError:
+                        continue  # Skip a blank, torn or corrupted line
+
+    def append(self, metrics: List[Dict]):
+        """Append metrics as JSON lines in a single write"""
+        self._rotate_if_needed()
+        with open(self.metrics_file, 'ab') as f:
+            f.write(b''.join(map(dumps_line, metrics)))
+
+    def _rotate_if_needed(self):
+        """Move a full metrics file aside to bound history on disk"""
+        try:
+            if self.metrics_file.stat().st_size < self.ROTATE_BYTES:
+                return
+        except FileNotFoundError:
+            return
+        os.replace(self.metrics_file, self.rotated_file)
+
+    def _migrate_legacy_metrics(self):
+        """Convert a v3-performance.json array into the JSON Lines file once"""
+        if self.metrics_file.exists() or not self.legacy_file.exists():
+            return
+        try:
+            metrics = loads(self.legacy_file.read_bytes())
+        except ValueError:
+            print("⚠️  Warning: Corrupted metrics file, starting fresh")
+            metrics = []
+        self.metrics_file.write_bytes(b''.join(map(dumps_line, metrics)))
+        self.legacy_file.rename(self.legacy_file.with_name(self.legacy_file.name + '.migrated'))
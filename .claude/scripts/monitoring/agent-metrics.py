@@ -13,12 +13,17 @@ from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 import statistics
 
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'hooks' / 'utils'))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from hook_io import loads, dumps_indented
+from metrics_store import MetricsStore
+
 class AgentMetrics:
     def __init__(self, base_path: str = ".claude"):
         self.base_path = Path(base_path)
         self.metrics_dir = self.base_path / "metrics"
         self.metrics_dir.mkdir(exist_ok=True)
-        self.metrics_file = self.metrics_dir / "v3-performance.json"
+        self.store = MetricsStore(self.metrics_dir)
         self.alerts_file = self.metrics_dir / "performance-alerts.json"
         
         # Performance thresholds
@@ -51,9 +56,7 @@ class AgentMetrics:
         }
         
         # Append to metrics file
-        metrics = self._load_metrics()
-        metrics.append(metric)
-        self._save_metrics(metrics)
+        self.store.append([metric])
         
         # Check thresholds and create alerts
         self._check_thresholds(agent_name, execution_time, success, tokens_used)
@@ -116,14 +119,12 @@ class AgentMetrics:
             
     def generate_report(self, time_window_hours: int = 24) -> Dict:
         """Generate comprehensive performance report"""
-        metrics = self._load_metrics()
+        metrics = list(self.store.iter_metrics())
         
         # Filter by time window
-        cutoff_time = datetime.now() - timedelta(hours=time_window_hours)
-        recent_metrics = [
-            m for m in metrics 
-            if datetime.fromisoformat(m['timestamp']) > cutoff_time
-        ]
+        # isoformat() timestamps sort chronologically; compare them as strings
+        cutoff = (datetime.now() - timedelta(hours=time_window_hours)).isoformat()
+        recent_metrics = [m for m in metrics if m['timestamp'] > cutoff]
         
         if not recent_metrics:
             return {'error': 'No metrics found in time window'}
@@ -153,8 +154,7 @@ class AgentMetrics:
         
         # Save report
         report_file = self.metrics_dir / f"performance-report-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
-        with open(report_file, 'w') as f:
-            json.dump(report, f, indent=2)
+        report_file.write_bytes(dumps_indented(report))
             
         return report
         
@@ -251,12 +251,9 @@ class AgentMetrics:
     def _get_recent_alerts(self, hours: int) -> List[Dict]:
         """Get recent performance alerts"""
         alerts = self._load_alerts()
-        cutoff_time = datetime.now() - timedelta(hours=hours)
+        cutoff = (datetime.now() - timedelta(hours=hours)).isoformat()
         
-        recent_alerts = [
-            a for a in alerts
-            if datetime.fromisoformat(a['timestamp']) > cutoff_time
-        ]
+        recent_alerts = [a for a in alerts if a['timestamp'] > cutoff]
         
         # Sort by timestamp descending
         recent_alerts.sort(key=lambda x: x['timestamp'], reverse=True)
@@ -312,29 +309,15 @@ class AgentMetrics:
             
         return recommendations
         
-    def _load_metrics(self) -> List[Dict]:
-        """Load metrics from file"""
-        if self.metrics_file.exists():
-            with open(self.metrics_file) as f:
-                return json.load(f)
-        return []
-        
-    def _save_metrics(self, metrics: List[Dict]) -> None:
-        """Save metrics to file"""
-        with open(self.metrics_file, 'w') as f:
-            json.dump(metrics, f, indent=2)
-            
     def _load_alerts(self) -> List[Dict]:
         """Load alerts from file"""
         if self.alerts_file.exists():
-            with open(self.alerts_file) as f:
-                return json.load(f)
+            return loads(self.alerts_file.read_bytes())
         return []
         
     def _save_alerts(self, alerts: List[Dict]) -> None:
         """Save alerts to file"""
-        with open(self.alerts_file, 'w') as f:
-            json.dump(alerts, f, indent=2)
+        self.alerts_file.write_bytes(dumps_indented(alerts))
             
     def display_dashboard(self) -> None:
         """Display a simple text dashboard of current metrics"""
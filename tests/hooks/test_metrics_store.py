@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Test suite for the shared agent metrics store
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add script and hook utility directories to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / '.claude/scripts'))
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / '.claude/hooks/utils'))
+
+import hook_io
+from metrics_store import MetricsStore
+
+
+@pytest.fixture(params=['orjson', 'json'])
+def json_backend(request, monkeypatch):
+    """Run each test with orjson (when installed) and the stdlib fallback."""
+    if request.param == 'json':
+        monkeypatch.setattr(hook_io, 'orjson', None)
+    elif hook_io.orjson is None:
+        pytest.skip('orjson is not installed')
+    return request.param
+
+
+class TestMetricsStore:
+    """Test reading and migrating the JSON Lines metrics file."""
+    
+    def test_torn_trailing_line_is_skipped(self, tmp_path, json_backend):
+        """Test a line cut inside a multibyte character does not break reads."""
+        store = MetricsStore(tmp_path)
+        store.append([{'agent': 'a', 'execution_time': 1.0}])
+        with open(store.metrics_file, 'ab') as f:
+            f.write(b'{"agent": "caf\xc3')
+        
+        assert list(store.iter_metrics()) == [{'agent': 'a', 'execution_time': 1.0}]
+    
+    def test_corrupt_legacy_file_starts_fresh(self, tmp_path, json_backend):
+        """Test an unreadable v3-performance.json is migrated as empty."""
+        (tmp_path / 'v3-performance.json').write_bytes(b'[{"agent": "\xc3')
+        
+        store = MetricsStore(tmp_path)
+        
+        assert list(store.iter_metrics()) == []
+        assert (tmp_path / 'v3-performance.json.migrated').exists()
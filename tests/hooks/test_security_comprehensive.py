@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Test suite for the Comprehensive Security Validator hook
+"""
+
+import importlib.util
+import os
+from pathlib import Path
+
+# Hook file names are not importable module names, so load it by path
+_HOOK_PATH = Path(__file__).parent.parent.parent / '.claude/hooks/pre-tool-use/security-comprehensive.py'
+_spec = importlib.util.spec_from_file_location('security_comprehensive', _HOOK_PATH)
+security_comprehensive = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(security_comprehensive)
+
+SecurityValidator = security_comprehensive.SecurityValidator
+
+
+class TestPIIProtection:
+    """Test PII sink detection and the findings cap."""
+    
+    def test_field_reported_once_per_sink(self):
+        """Test a field is only reported on its first line for each sink."""
+        content = 'console.log(user.email)\nconsole.log(user.email)\n'
+        validator = SecurityValidator()
+        validator.check_pii_protection(content, 'app/page.tsx')
+        
+        assert [(v['type'], v['line']) for v in validator.violations] == [('pii_in_console', 1)]
+        assert validator.pii_capped is False
+    
+    def test_cap_applies_within_a_single_line(self):
+        """Test one line hitting every sink cannot exceed the cap."""
+        fields = ' '.join(SecurityValidator.PII_FIELDS)
+        content = f'console.log(localStorage.setItem("?{fields}"))'
+        validator = SecurityValidator()
+        validator.check_pii_protection(content, 'app/page.tsx')
+        
+        assert len(validator.violations) == SecurityValidator.MAX_PII_VIOLATIONS
+        assert validator.pii_capped is True
+    
+    def test_cap_flag_reaches_response(self):
+        """Test a capped scan is flagged in the validation result."""
+        fields = ' '.join(SecurityValidator.PII_FIELDS)
+        content = f'localStorage.setItem("{fields}")\nconsole.log(url + "?{fields}")\n'
+        result = SecurityValidator().validate({'content': content, 'path': 'app/page.tsx'})
+        
+        assert result['approved'] is False
+        assert result['pii_capped'] is True
+        pii = [v for v in result['violations'] if v['type'].startswith('pii_')]
+        assert len(pii) == SecurityValidator.MAX_PII_VIOLATIONS
+
+
+class TestResultCache:
+    """Test the on-disk validation result cache."""
+    
+    def test_write_prunes_expired_entries_in_shard(self, tmp_path, monkeypatch):
+        """Test expired results in the written shard are deleted."""
+        monkeypatch.setattr(security_comprehensive, '_CACHE_DIR', tmp_path)
+        operation = {'path': 'app/page.tsx', 'content': 'const x = 1'}
+        shard = security_comprehensive._cache_path(operation).parent
+        shard.mkdir(parents=True)
+        stale = shard / 'stale'
+        fresh = shard / 'fresh'
+        stale.write_text('{}')
+        fresh.write_text('{}')
+        expired = security_comprehensive.time.time() - security_comprehensive._CACHE_TTL - 1
+        os.utime(stale, (expired, expired))
+        
+        security_comprehensive._check(operation)
+        
+        assert not stale.exists()
+        assert fresh.exists()
+        assert security_comprehensive._cache_path(operation).exists()
+
+
+class TestScanLimit:
+    """Test sampling of oversized content."""
+    
+    def test_limit_counts_encoded_bytes(self, monkeypatch):
+        """Test multi-byte content is measured by its UTF-8 size."""
+        monkeypatch.setattr(security_comprehensive, '_SCAN_MAX_BYTES', 10)
+        
+        assert security_comprehensive._exceeds_scan_limit('é' * 6) is True
+        assert security_comprehensive._exceeds_scan_limit('e' * 6) is False
+    
+    def test_truncated_scan_is_not_a_clean_pass(self, monkeypatch):
+        """Test PII hidden in the unscanned middle yields a partial-scan warning."""
+        monkeypatch.setattr(security_comprehensive, '_SCAN_MAX_BYTES', 1024)
+        monkeypatch.setattr(security_comprehensive, '_SCAN_SAMPLE_CHARS', 256)
+        padding = '// filler\n' * 100
+        content = padding + 'console.log(user.ssn)\n' + padding
+        result = SecurityValidator().validate({'content': content, 'path': 'app/page.tsx'})
+        
+        assert result['truncated'] is True
+        assert result['message'] == 'Approved with warnings'
+        assert [w['type'] for w in result['warnings']] == ['partial_scan']
+    
+    def test_svg_files_are_scanned(self, tmp_path, monkeypatch):
+        """Test SVG markup is validated rather than skipped."""
+        monkeypatch.setattr(security_comprehensive, '_CACHE_DIR', tmp_path)
+        operation = {'path': 'public/logo.svg', 'content': '<svg><script>eval(x)</script></svg>'}
+        
+        result = security_comprehensive.loads(security_comprehensive._check(operation))
+        
+        assert result['approved'] is False